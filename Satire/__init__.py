@@ -31,13 +31,29 @@ The Satire module
 A simple CDCL solver in Python
 """
 
+import os
 import sys
 import signal
 import argparse
 import random
+import time
+import json
+import math
+import traceback
+import heapq
+import multiprocessing
+from itertools import chain
 
 from definitions import *
 from structures import *
+from branching import *
+from phases import *
+from restarts import *
+from progress import *
+from dimacs import *
+from preprocessing import Preprocessor
+from proof import DratWriter
+from sharing import ClauseExchange
 import statistics as stat
 
         
@@ -97,23 +113,41 @@ class Clause(array):
 class ClauseBase:
     """
     Watched literals structure
-    self._clauses contains all clauses (even unit)
-    self._learnts contains the indices of active learnt clauses
-    self._status[k] gives the current status of the k-th clause in {ACTIVE, INACTIVE, TO_DEACTIVATE}
+    self._arena contains all clauses (even unit) except binary clauses, stored contiguously in a single array:
+        - a clause is addressed by its offset k in the arena
+        - self._arena[k] is the header of the clause: its current status in {ACTIVE, INACTIVE, TO_DEACTIVATE} (header&STATUS), 
+          whether it was LEARNT, whether it was USED in conflict analysis since the last reduction, whether it was IMPORTED from another solver and not used yet, and its LBD (header>>LBD_SHIFT)
+        - self._arena[k+1] is the size of the clause
+        - self._arena[k+2:k+2+size] are its literals
+    the offsets of active learnt (non-binary) clauses are in three tiers, according to their LBD:
+        - self._core contains the clauses that are never forgotten
+        - self._tier2 contains the clauses that are kept as long as they are used
+        - self._learnts contains the other (local) clauses
     
     self._watcher_of is the watched literal structure per se
-        - indices of clauses are stored instead of objects so that we can use arrays instead of list
-        - the invariant (after UP) is that clause[0] and clause[1] are watched by clause
+        - offsets of clauses are stored instead of objects so that we can use arrays instead of list
+        - each offset is followed by a blocker literal of the clause: when the blocker is true the clause is satisfied and can be skipped without being loaded
+        - the invariant (after UP) is that the first two literals of a clause are watched by the clause
         - clause removal is "lazy": the clause is removed from its watched literals list only when trying to update them
-        - there is no procedure to actually get rid of a clause yet, it is simply lazily removed from the watch struct
+        - the space of deactivated clauses (self._wasted words) is reclaimed by collectGarbage(), which compacts the arena and renumbers the remaining clauses
+        
+    self._binary_of is the implication list of binary clauses (original and learnt)
+        - q is in self._binary_of[p] iff (p q) is a binary clause, i.e., q is implied as soon as p becomes false
+        - binary clauses are never forgotten, and the reason of a literal implied by a binary clause is simply the other (false) literal
     """
     def __init__(self, num_atoms=DEFAULT_SIZE, clauses=[]):
-        self._clauses = []
+        self._arena   = array('I')
+        self._core    = []
+        self._tier2   = []
         self._learnts = []
-        self._status  = array('i')
+        self._wasted  = 0
         self._watcher_of = [array('I') for i in range(2*num_atoms)]
+        self._binary_of  = [array('I') for i in range(2*num_atoms)]
+        self._num_learnt_binaries = 0
         for clause in clauses:
-            if len(clause)>1:
+            if len(clause)==2:
+                self._add_binary_(clause[0], clause[1])
+            elif len(clause)>2:
                 self._unchecked_add_(clause)
         
     def resize(self, n):
@@ -121,31 +155,116 @@ class ClauseBase:
         resize the watched literals structure when adding new atoms
         """
         for i in range(len(self._watcher_of), n):
-            self._watcher_of.append([])
+            self._watcher_of.append(array('I'))
+            self._binary_of.append(array('I'))
         
     def deactivateClause(self,k):
         """
-        mark the k-th clause to be deactivated upon the next update
+        mark the clause at offset k to be deactivated upon the next update
+        """
+        self._arena[k] = (self._arena[k]&~STATUS) | TO_DEACTIVATE
+        self._wasted += 2+self._arena[k+1]
+        
+    def _allocate_(self, clause, header):
+        """
+        copy the clause at the end of the arena and returns its offset
+        """
+        k = len(self._arena)
+        self._arena.append(header)
+        self._arena.append(len(clause))
+        self._arena.extend(clause)
+        return k
+                            
+    def collectGarbage(self):
+        """
+        removes the deactivated clauses from the arena and from the watch lists
+        the remaining clauses are moved toward the start of the arena (their relative order is preserved)
+        returns the relocation map, from the previous to the new offset of every remaining clause
         """
-        self._status[k] = TO_DEACTIVATE
+        arena = self._arena
+        relocation = {}
+        end = len(arena)
+        k = new = 0
+        while k < end:
+            length = 2+arena[k+1]
+            if arena[k]&STATUS != TO_DEACTIVATE:
+                if new < k:
+                    arena[new:new+length] = arena[k:k+length]
+                relocation[k] = new
+                new += length
+            k += length
+        del arena[new:]
+        self._wasted = 0
+        
+        for watches in self._watcher_of:
+            j = 0
+            for i in range(0, len(watches), 2):
+                k = watches[i]
+                if k in relocation:
+                    watches[j] = relocation[k]
+                    watches[j+1] = watches[i+1]
+                    j += 2
+            del watches[j:]
+        
+        self._core    = [relocation[k] for k in self._core]
+        self._tier2   = [relocation[k] for k in self._tier2]
+        self._learnts = [relocation[k] for k in self._learnts]
+        return relocation
                             
-    def _unchecked_add_(self,clause):
+    def _unchecked_add_(self,clause,header=ACTIVE):
         """
-        add the clause onto the watched literals structure
+        add the clause onto the watched literals structure and returns its offset
         Warning: does not check the current size
         """
-        self._watcher_of[clause[0]].append(len(self._clauses))
-        self._watcher_of[clause[1]].append(len(self._clauses))
-        self._clauses.append(clause)
-        self._status.append(ACTIVE)
+        k = self._allocate_(clause, header)
+        self._watcher_of[clause[0]].extend((k, clause[1]))
+        self._watcher_of[clause[1]].extend((k, clause[0]))
+        return k
+        
+    def _add_binary_(self, p, q):
+        """
+        add the binary clause (p q) onto the implication lists
+        """
+        self._binary_of[p].append(q)
+        self._binary_of[q].append(p)
         
-    def _remove_watcher_(self, l, pos):
+    def clause(self, k):
         """
-        remove the pos-th clause watching l [used in update()]
+        returns (a copy of) the clause at offset k
         """
-        if pos < len(self._watcher_of[l])-1:
-            self._watcher_of[l][-1], self._watcher_of[l][pos] = self._watcher_of[l][pos], self._watcher_of[l][-1]
-        self._watcher_of[l].pop()
+        return Clause(self._arena[k+2:k+2+self._arena[k+1]])
+        
+    def arenaClauses(self):
+        """
+        iterates over the offsets of the clauses stored in the arena
+        """
+        k = 0
+        while k < len(self._arena):
+            yield k
+            k += 2+self._arena[k+1]
+        
+    def arenaLiterals(self):
+        """
+        iterates over the literals of the clauses stored in the arena (as slices of the arena)
+        """
+        arena = self._arena
+        for k in self.arenaClauses():
+            yield arena[k+2:k+2+arena[k+1]]
+        
+    def binaryClauses(self):
+        """
+        iterates over the binary clauses, as pairs of literals
+        """
+        for p in range(len(self._binary_of)):
+            for q in self._binary_of[p]:
+                if p < q:
+                    yield (p, q)
+                    
+    def clauses(self):
+        """
+        iterates over all the clauses (as sequences of literals), including unit and binary clauses
+        """
+        return chain(self.arenaLiterals(), self.binaryClauses())
         
     def __len__(self):
         return len(self.clauses)
@@ -158,8 +277,10 @@ class ClauseBase:
         for a in atoms:
             for spin in (0,1):
                 ostr += 'watched by '+lit_to_str(literal(a,spin))+':'
-                for c in self._watcher_of[literal(a,spin)]:
-                    ostr += ' '+str(self._clauses[c])
+                for c in self._watcher_of[literal(a,spin)][::2]:
+                    ostr += ' '+str(self.clause(c))
+                for q in self._binary_of[literal(a,spin)]:
+                    ostr += ' '+str(Clause((literal(a,spin), q)))
                 ostr += '\n'
         return ostr
 ########################################
@@ -245,8 +366,11 @@ class CompactDomain:
 class Solver(ClauseBase,BeliefBase):
     """
     SAT Engine
+    - No trace nor check in the search loop, see InstrumentedSolver for debugging
     - Inherit of ClauseBase (this seems faster than going through an attribute?)
     - Inherit of BeliefBase (this seems faster than going through an attribute?)
+    - If self._proof is set (to a proof.DratWriter, before the search), the learned clauses, the forgotten clauses, the steps of the preprocessing and the final empty clause are written in a DRAT proof (clauses added between two calls to solve are not part of the proof)
+    - If self._exchange is set (to a sharing.ClauseExchange), the short learned clauses are exported to the other solvers, and the clauses they exported are imported at every restart
     """
     ################################
     ########   CONSTRUCTOR  ########
@@ -255,27 +379,70 @@ class Solver(ClauseBase,BeliefBase):
         ClauseBase.__init__(self,n)
         BeliefBase.__init__(self,n)
         self._num_atoms    = n
+        # atoms of the instance (declared by the dimacs header, or used by a clause or an assumption), the other atoms are left out of the models
+        self._num_variables = 0
         self._unpropagated = 0
         self._level        = 0
         self._truth        = array('I',[FALSE]*n)
+        self._value        = array('b',[UNDEF]*(2*n))
         self._reason       = [None]*n
         self._asg_level    = [0]*n
+        self._seen         = array('b',[0]*n)
+        self._level_stamp  = array('i',[0]*(n+1))
+        self._stamp        = 0
         # self._activity     = [0.0]*n
         self._trail        = array('i')
+        self._inconsistent = False
+        self._heuristic    = None
+        self._assumptions  = []
+        self._failed       = None
+        self._assumption_core = []
+        self._outcome      = UNDEF
+        # clauses received from the other solvers and not added yet (they wait for a restart to level 0)
+        self._imports      = []
         
-        # statistics
-        self.num_choice    = stat.Statistic('number of choices', 0)
-        self.num_conflict  = stat.Statistic('number of conflicts', 0)
-        self.num_propag    = stat.Statistic('number of propagations', 0)
+        # statistics (the counters of the search are plain integers, read by the Statistic objects when reporting)
+        self._num_choice    = 0
+        self._num_conflict  = 0
+        self._num_propag    = 0
+        self._num_minimized = 0
+        self._num_restart   = 0
+        self._num_exported  = 0
+        self._num_imported  = 0
+        self._num_imported_used = 0
+        self.num_choice    = stat.StatCounter('number of choices', self, '_num_choice')
+        self.num_conflict  = stat.StatCounter('number of conflicts', self, '_num_conflict')
+        self.num_propag    = stat.StatCounter('number of propagations', self, '_num_propag')
         self.num_learnt    = stat.StatNumLearnt(self)
-        self.max_activity  = stat.Statistic('maximum activity', 0)
+        self.num_minimized = stat.StatCounter('number of minimized literals', self, '_num_minimized')
+        self.num_restart   = stat.StatCounter('number of restarts', self, '_num_restart')
+        self.num_exported  = stat.StatCounter('number of exported clauses', self, '_num_exported')
+        self.num_imported  = stat.StatCounter('number of imported clauses', self, '_num_imported')
+        self.num_imported_used = stat.StatCounter('number of imported long clauses used in conflict analysis', self, '_num_imported_used')
         self.cpu_time      = stat.StatRunTime()
         
         # parameters
-        self._activity_increment = 1e-100
-        self._activity_decay     = 1.1
-        self._activity_bound     = 1e1000000
-        self._forgetfulness      = .6
+        self._branching          = EVSIDS
+        self._phase_policy       = PHASE_SAVED
+        self._rephase_interval   = 0
+        self._restart_strategy   = Luby
+        self._reuse_trail        = False
+        self._next_rephase       = 0
+        self._forgetfulness      = .5
+        self._core_lbd           = 2
+        self._tier2_lbd          = 6
+        self._reduce_interval    = 2000
+        self._reduce_increment   = 300
+        self._next_reduce        = self._reduce_interval
+        self._garbage_fraction   = .2
+        self._minimization       = MIN_RECURSIVE
+        self._progress           = None
+        self._deadline           = None
+        self._preprocessing      = False
+        self._preprocessor       = None
+        self._proof              = None
+        self._exchange           = None
+        self._import_batch       = 100
         
         # this is used to speed up randomization. Instead of drawing a random number at every decision, we draw randomly when will be the next non-optimal decision (randcounter, uniformly picked in [1/(2*_randomness), 3/(2*_randomness)])
         self._randomness         = .05
@@ -298,11 +465,19 @@ class Solver(ClauseBase,BeliefBase):
             ClauseBase.resize(self,2*n)
             BeliefBase.resize(self,n)
             self._truth.extend([FALSE]*(n-self._num_atoms))
+            self._value.extend([UNDEF]*(2*(n-self._num_atoms)))
             self._reason.extend([None]*(n-self._num_atoms))
             self._asg_level.extend([0]*(n-self._num_atoms))
+            self._seen.extend([0]*(n-self._num_atoms))
+            self._level_stamp.extend([0]*(n-self._num_atoms))
             # self._activity.extend([.0]*(n-self._num_atoms))
             # self._fact.resize(n)
             self._num_atoms = n
+            if self._heuristic != None:
+                self._heuristic.resize(n)
+                self._phases.resize(n)
+            if self._proof != None:
+                self._proof.resize(n)
         
                         
     ################################
@@ -314,63 +489,300 @@ class Solver(ClauseBase,BeliefBase):
         """
         return self._num_atoms
         
-    def addClause(self,clause):
+    def addClause(self, clause, lbd=None):
         """
-        add a new clause to the data base
+        add a new clause to the data base, the solver backtracks to level 0 first (clauses can be added between two calls to solve)
+        the clause is simplified by the atoms known at level 0: satisfied clauses are ignored and false literals removed
+        unit clauses are inferred, an empty clause (after simplification) makes the data base inconsistent
+        the simplified clause is written in the proof (if any), since it replaces the given clause
+        if lbd is not None, the clause was learned (and IMPORTED) from another solver with this LBD, it is put in the tier of its LBD (and may be forgotten)
+        returns False if the clause was ignored (satisfied at level 0), and True otherwise
         """
-        if len(clause)>1:
+        self.backtrackTo(0)
+        n = max(clause)/2+1 if len(clause)>0 else 0
+        if n > self._num_atoms:
+            self.resize(n)
+        if n > self._num_variables:
+            self._num_variables = n
+        if self._preprocessor != None:
+            for p in clause:
+                if self._preprocessor.eliminated(atom(p)):
+                    raise ValueError('atom '+str(atom(p)+1)+' was eliminated by the preprocessing')
+        value = self._value
+        if self._size > 0:
+            if any(value[p] == TRUE for p in clause):
+                return False
+            size = len(clause)
+            clause = [p for p in clause if value[p] != FALSE]
+            if self._proof != None and len(clause) < size:
+                self._proof.add(clause)
+        if len(clause)==2:
+            self._add_binary_(clause[0], clause[1])
+        elif len(clause)>2 and lbd != None:
+            self.classify(self._unchecked_add_(clause, ACTIVE|LEARNT|IMPORTED|(lbd<<LBD_SHIFT)), lbd)
+        elif len(clause)>2:
             self._unchecked_add_(clause)
+        elif len(clause)==0:
+            self._inconsistent = True
         else:
-            self.infer(clause[0])
-            self._clauses.append(clause)
-            self._status.append(INACTIVE)
+            self.infer(clause[0], self._allocate_(clause, INACTIVE))
+        return True
             
-    def restartSearch(self, base=100, factor=1.2):
+    def solve(self, assumptions=[], limit=-1):
         """
-        standard search with geometric restarts 
+        incremental search: the literals in assumptions are decided first (in this order, one per level), gives up (UNDEF) after limit more conflicts if limit is not negative
+        returns FALSE if there is no model extending the assumptions, either because of the clauses alone (then the solver is inconsistent for good) or because of the assumption self._failed
+        the learned clauses, the activities and the phases are kept from one call to the next, clauses can be added in between
         """
-        self.initActivity()
-        rlimit = base
-        outcome = UNDEF
+        for p in assumptions:
+            if atom(p) >= self._num_atoms:
+                self.resize(atom(p)+1)
+            if atom(p) >= self._num_variables:
+                self._num_variables = atom(p)+1
+            if self._preprocessor != None and self._preprocessor.eliminated(atom(p)):
+                raise ValueError('atom '+str(atom(p)+1)+' was eliminated by the preprocessing')
+        self._assumptions = list(assumptions)
+        return self.restartSearch(limit)
+        
+    def restartSearch(self, limit=-1):
+        """
+        standard search with restarts (following the strategy _restart_strategy), gives up (UNDEF) after limit more conflicts if limit is not negative, or at the time _deadline if it is not None (checked after every conflict)
+        starts from level 0, the branching heuristic and the phases are initialised at the first call only
+        """
+        self.backtrackTo(0)
+        self._failed = None
+        self._assumption_core = []
+        if self._preprocessing and self._preprocessor == None:
+            self.preprocess()
+        if self._heuristic == None:
+            self.initActivity()
+        if limit >= 0:
+            limit += self._num_conflict
+        outcome = FALSE if self._inconsistent else UNDEF
         while outcome == UNDEF:
-            self.cpu_time.update()
-            print 'restart with limit = %i -- %s -- %s'%(base, self.num_conflict, self.cpu_time)
-            outcome = self.generate(conf_limit=rlimit)
+            outcome = self.generate(conf_limit=limit)
             if outcome == UNDEF:
-                while self._level>0:
-                    self.undo()
-                base = int(base * factor)
-                rlimit += base
-                self.forget()
+                if (limit >= 0 and self._num_conflict >= limit) or (self._deadline != None and time.time() >= self._deadline):
+                    break
+                self.restart()
+                if self._inconsistent:
+                    outcome = FALSE
+        if outcome == FALSE and self._failed == None:
+            self._inconsistent = True
+            if self._proof != None:
+                self._proof.add([])
+                self._proof.flush()
+        if self._failed != None:
+            self._assumption_core = self.analyzeFinal(self._failed)
+        self._outcome = outcome
+        if outcome == TRUE and self._preprocessor != None:
+            self.extendModel()
+        if self._progress != None:
+            self._progress.report('SAT' if outcome == TRUE else 'UNSAT' if outcome == FALSE else 'UNKNOWN')
         return outcome
+        
+    def model(self):
+        """
+        returns the model found by the last call to solve (or restartSearch) as a list of dimacs literals (one per atom of the instance), or None if it did not return TRUE
+        """
+        if self._outcome != TRUE:
+            return None
+        return [lit_to_dimacs(literal(a, self._truth[a])) for a in range(self._num_variables)]
+        
+    def core(self):
+        """
+        returns the assumptions (as dimacs literals) that cannot be all true, according to the last call to solve, or None if it did not return FALSE
+        the list is empty if the clauses alone are inconsistent
+        """
+        if self._outcome != FALSE:
+            return None
+        return [lit_to_dimacs(p) for p in self._assumption_core]
+        
+    def analyzeFinal(self, p):
+        """
+        final conflict analysis, when the assumption p is false: returns the subset of the assumptions (the decisions of the current branch) that imply the opposite of p, plus p itself
+        the trail is walked backward from the last literal to the end of level 0, marking the atoms of the reasons of the marked atoms
+        """
+        core = [p]
+        if self._level == 0 or self._asg_level[atom(p)] == 0:
+            return core
+        seen = self._seen
+        arena = self._arena
+        seen[atom(p)] = SEEN
+        for index in range(self._size-1, self._trail[0]-1, -1):
+            a = self._known[index]
+            if not seen[a]:
+                continue
+            seen[a] = 0
+            reason = self._reason[a]
+            if reason == None:
+                core.append(literal(a, self._truth[a]))
+            elif reason < 0:
+                b = atom(~reason)
+                if self._asg_level[b] > 0:
+                    seen[b] = SEEN
+            else:
+                for q in arena[reason+3:reason+2+arena[reason+1]]:
+                    if self._asg_level[atom(q)] > 0:
+                        seen[atom(q)] = SEEN
+        return core
+        
+    def preprocess(self):
+        """
+        simplifies the clause base (see preprocessing.Preprocessor), must be called before the search
+        the clause and belief bases are rebuilt from the simplified clauses, and the eliminated atoms are put in the belief base (at level 0, without reason) so that they are never decided
+        """
+        preprocessor = Preprocessor(self._num_atoms, self.clauses(), frozen=[atom(p) for p in self._assumptions], proof=self._proof)
+        self._preprocessor = preprocessor
+        if not preprocessor.simplify():
+            self._inconsistent = True
+            return
+        value = self._value
+        for a in self._known[:self._size]:
+            value[2*a] = value[2*a+1] = UNDEF
+        self._size = self._unpropagated = 0
+        self._arena = array('I')
+        self._wasted = 0
+        self._watcher_of = [array('I') for p in range(len(self._watcher_of))]
+        self._binary_of = [array('I') for p in range(len(self._binary_of))]
+        for clause in preprocessor.clauses():
+            self.addClause(clause)
+        for a in range(self._num_atoms):
+            if preprocessor.eliminated(a):
+                self.infer(literal(a, self._truth[a]))
+                
+    def extendModel(self):
+        """
+        sets the atoms eliminated by the preprocessing so that the current model satisfies the original clauses
+        """
+        for a in self._preprocessor.extend(self._truth):
+            p = literal(a, self._truth[a])
+            self._value[p] = TRUE
+            self._value[p^1] = FALSE
+        
+    def restart(self):
+        """
+        backtracks to level 0, or to the highest level that would be rebuilt identically if _reuse_trail is set, and reclaims the space of the forgotten clauses if it is worth it
+        the clauses received from the other solvers are added at level 0 only: a partial restart keeps them waiting, unless one of them is a unit or a binary clause, or more than _import_batch are waiting
+        """
+        if self._exchange != None:
+            self._imports.extend(self._exchange.receive())
+        level = self.reusedLevel() if self._reuse_trail else 0
+        if level > 0 and (len(self._imports) > self._import_batch or any(len(clause) <= 2 for clause, lbd in self._imports)):
+            level = 0
+        self.backtrackTo(level)
+        self._restarter.restart()
+        self._num_restart += 1
+        if self._wasted > self._garbage_fraction * len(self._arena):
+            self.collectGarbage()
+        if level == 0 and len(self._imports) > 0:
+            self.importClauses()
+            
+    def importClauses(self):
+        """
+        adds the received clauses as learned clauses (at level 0), those satisfied at level 0 are not counted as imported
+        """
+        for clause, lbd in self._imports:
+            if self.addClause(clause, lbd):
+                self._num_imported += 1
+        self._imports = []
+            
+    def reusedLevel(self):
+        """
+        returns the highest level whose decisions are all preferred (by the branching heuristic) to the next decision: after a full restart, these decisions would be taken again in the same order (randomization aside)
+        """
+        if self.num_choices() == 0:
+            return self._level
+        heuristic = self._heuristic
+        decision = heuristic.decide()
+        heuristic.reinsert([decision])
+        score = heuristic.score(decision)
+        level = 0
+        while level < self._level and heuristic.score(self._known[self._trail[level]]) > score:
+            level += 1
+        return level
             
     def getStatistics(self):
         """
         returns a bunch of statistics
         """   
         self.cpu_time.update()  
-        return str(self.num_choice)+'\n'+str(self.num_learnt)+'\n'+str(self.num_conflict)+'\n'+str(self.num_propag)+'\n'+str(self.cpu_time)
+        return str(self.num_choice)+'\n'+str(self.num_learnt)+'\n'+str(self.num_minimized)+'\n'+str(self.num_conflict)+'\n'+str(self.num_propag)+'\n'+str(self.num_restart)+'\n'+str(self.cpu_time)+('' if self._preprocessor == None else '\n'+str(self._preprocessor))+('' if self._exchange == None else '\n'+str(self.num_exported)+'\n'+str(self.num_imported)+'\n'+str(self.num_imported_used))
             
-    def readDimacs(self, filename):
-        """
-        initialise clause and belief bases from a dimacs file
-        """
-        self.comments = []
-        cnffile = open(filename, 'r')
-        num_cl = 0
-        for line in cnffile:
-            if line.startswith('p') :
-                data = line.split()
-                num_atoms = int(data[2])
-                self.resize(num_atoms)
-                num_cl = int(data[3])
-            elif num_cl > 0:
-                data = line.split()
-                self.addClause(Clause([lit(int(p)) for p in data[:-1]]))
-                num_cl -= 1
-            else:
-                self.comments.append(line)
-                                  
+    def readDimacs(self, filename, cache=None):
+        """
+        initialise clause and belief bases from a dimacs file (possibly compressed, see dimacs.DimacsReader)
+        if cache is not None, the clause base is loaded from the binary cache of the file in the directory cache (next to the file if cache is empty) when it is up to date, and the cache is (re)written otherwise
+        the cache is not read if a proof is written, since the simplifications of the clauses at level 0 would be missing from the proof
+        """
+        if cache != None:
+            cachename = cachePath(filename, cache)
+            if self._proof == None and os.path.exists(cachename) and self.readCache(cachename, filename):
+                return
+        reader = DimacsReader(filename)
+        self.comments = reader.comments
+        for clause in reader.clauses():
+            if reader.num_atoms > self._num_atoms:
+                self.resize(reader.num_atoms)
+            self.addClause(clause)
+        self._num_variables = max(self._num_variables, reader.num_atoms)
+        if cache != None:
+            self.writeCache(cachename, filename)
+            
+    def writeCache(self, cachename, filename):
+        """
+        writes the clause base (arena, watch lists and implication lists, as flat arrays) and the unit clauses in the binary cache file cachename, for the source file filename
+        must be called before the search starts, the file is written under a temporary name and then renamed, so that concurrent solvers never read a partial cache
+        nothing is written if the clause base is already inconsistent
+        """
+        if self._inconsistent:
+            return
+        watches, binaries = array('I'), array('I')
+        watch_lengths, binary_lengths = array('I'), array('I')
+        for p in range(2*self._num_atoms):
+            watches.extend(self._watcher_of[p])
+            watch_lengths.append(len(self._watcher_of[p]))
+            binaries.extend(self._binary_of[p])
+            binary_lengths.append(len(self._binary_of[p]))
+        units = array('I', [self._reason[a] for a in self._known[:self._size]])
+        comments = ''.join(self.comments)
+        status = os.stat(filename)
+        temporary = '%s.%i.tmp'%(cachename, os.getpid())
+        with open(temporary, 'wb') as cachefile:
+            cachefile.write(cacheHeader(status, fileDigest(filename), self._num_atoms, self._num_variables, len(self._arena), len(watches), len(binaries), len(units), len(comments)))
+            for data in (self._arena, watch_lengths, watches, binary_lengths, binaries, units):
+                data.tofile(cachefile)
+            cachefile.write(comments)
+        os.rename(temporary, cachename)
+        
+    def readCache(self, cachename, filename):
+        """
+        loads the clause base from the binary cache file cachename, returns False (and loads nothing) if it is not up to date with the source file filename
+        the arrays are read in bulk, only the unit clauses are inferred one by one
+        """
+        with open(cachename, 'rb') as cachefile:
+            header = readCacheHeader(cachefile, filename)
+            if header == None:
+                return False
+            num_atoms, num_variables, num_arena, num_watches, num_binaries, num_units, num_comments = header[8:]
+            self.resize(num_atoms)
+            self._num_variables = max(self._num_variables, num_variables)
+            self._arena.fromfile(cachefile, num_arena)
+            for lists, total in ((self._watcher_of, num_watches), (self._binary_of, num_binaries)):
+                lengths, flat = array('I'), array('I')
+                lengths.fromfile(cachefile, 2*num_atoms)
+                flat.fromfile(cachefile, total)
+                start = 0
+                for p in range(2*num_atoms):
+                    lists[p] = flat[start:start+lengths[p]]
+                    start += lengths[p]
+            units = array('I')
+            units.fromfile(cachefile, num_units)
+            self.comments = cachefile.read(num_comments).splitlines(True)
+        for k in units:
+            self.infer(self._arena[k+2], k)
+        return True
+        
     def writeDimacs(self, filename):
         """
         writes the clause and belief bases to the dimacs format
@@ -378,8 +790,9 @@ class Solver(ClauseBase,BeliefBase):
         cnffile = open(filename, 'w')
         for line in self.comments:
             cnffile.write(line)
-        cnffile.write('p cnf '+str(self._num_atoms)+' '+str(len(self._clauses))+'\n')
-        for clause in self._clauses:
+        clauses = list(self.clauses())
+        cnffile.write('p cnf '+str(self._num_atoms)+' '+str(len(clauses))+'\n')
+        for clause in clauses:
             cnffile.write(' '.join([lit_to_str(l,'') for l in clause])+' 0\n')
             
             
@@ -390,8 +803,7 @@ class Solver(ClauseBase,BeliefBase):
         """
         current belief on the literal p (in {TRUE, FALSE, UNDEF})
         """
-        a = atom(p)
-        return self._truth[a]==spin(p) if self.known(a) else UNDEF
+        return self._value[p]
         
     def atom_truth(self, a):
         """
@@ -405,40 +817,16 @@ class Solver(ClauseBase,BeliefBase):
     ################################       
     def initActivity(self):
         """
-        initialise atom activities
+        initialise the branching heuristic (self._branching), atom activities are initialised with their weighted number of occurrences
         """
         activity = [.0]*self._num_atoms
-        for clause in self._clauses:
+        for clause in self.clauses():
             for l in clause:
-                a = atom(l)
-                activity[a] += self._activity_increment/len(clause)
-                if activity[a] > self.max_activity.getValue():
-                    self.max_activity.setValue(activity[a])
-        self._activity = ActivityHeap(activity)
-                
-    def decay(self):
-        """
-        decay atom activities
-        """
-        self._activity_increment *= self._activity_decay
-        max_activity = self.max_activity.getValue()
-        if self._activity_bound - self._activity_increment < max_activity:
-            # for a in range(self._num_atoms):
-            #     self._activity[a] = self._activity[a]/max_activity*self._activity_increment
-            self._activity.scaleDown(max_activity, self._activity_increment)
-            self.max_activity.setValue(self._activity_increment)
-        
-    def increaseActivity(self, a):
-        """
-        increase the activity of atom a
-        """
-        new_activity = self._activity[a] + self._activity_increment
-        if (VERBOSE&DBG_ACTIVITY)>0:
-            print 'increase activity of', (a+1), new_activity
-        self._activity[a] = new_activity
-        if new_activity > self.max_activity.getValue():
-            self.max_activity.setValue(new_activity)
-        # print 'end increase'
+                activity[atom(l)] += 1.0/len(clause)
+        self._heuristic = self._branching(self, activity)
+        self._phases = PhaseSelector(self, self._phase_policy, rephasing=self._rephase_interval > 0)
+        self._restarter = self._restart_strategy(self)
+        self._next_rephase = self._num_conflict + self._rephase_interval
  
     def nextAtom(self):
         """
@@ -448,20 +836,9 @@ class Solver(ClauseBase,BeliefBase):
         
     def mostActiveAtom(self):
         """
-        returns the atom with highest activity not yet in the belief base
+        returns the best atom not yet in the belief base, according to the branching heuristic
         """
-        a = self._activity.heappop()
-        if (VERBOSE&DBG_ACTIVITY)>0:
-            print 'look for most active atom', (a+1), '?'
-        while self.known(a):
-            if (VERBOSE&DBG_ACTIVITY)>0:
-                print '  no, already set'
-            a = self._activity.heappop()
-            if (VERBOSE&DBG_ACTIVITY)>0:
-                print ' ', (a+1), '?'
-        if (VERBOSE&DBG_ACTIVITY)>0:
-            print '  ok!'
-        return a
+        return self._heuristic.decide()
         
     def mostActiveAtomRand(self):
         """
@@ -473,8 +850,7 @@ class Solver(ClauseBase,BeliefBase):
         if self._randomness ==0 or self._randcounter > 0 or self.num_choices() == 1 :
             return a
             
-        b = self.mostActiveAtom()
-        self._activity.push(a)
+        b = self._heuristic.alternative(a)
         
         self._randcounter = self._randcounter = random.randint(self._min_r, self._max_r)
         
@@ -493,67 +869,92 @@ class Solver(ClauseBase,BeliefBase):
         t = spin(p)
         self.add(a)
         self._truth[a]     = t
+        self._value[p]     = TRUE
+        self._value[p^1]   = FALSE
         self._reason[a]    = reason
         self._asg_level[a] = self._level
-        if (VERBOSE&DBG_SEARCH)>0 or (VERBOSE&DBG_LEARNING)>0:
-            print ''.join([' ' for i in range(self._level)]), 'infer', lit_to_str(literal(a,t)), '(reason='+str(reason)+') ['+str(self._level)+']'
     
     def save(self):
         """
         stores the current state in order to backtrack later
+        there may be more levels than atoms (assumptions that are repeated or already true open empty levels), so _level_stamp is grown with them
         """
         self._trail.append(self._size)
         self._level += 1
+        if self._level >= len(self._level_stamp):
+            self._level_stamp.append(0)
         
     def undo(self):
         """
         backtracks to the previous state
         """
-        self._size = self._trail.pop()
-        for a in self[self._size:self._unpropagated]:
-            self._activity.push(a)
-        self._unpropagated = self._size
-        self._level -= 1
+        self.backtrackTo(self._level-1)
+        
+    def backtrackTo(self, level):
+        """
+        backtracks to the state saved at the given level, in one step
+        """
+        if level >= self._level:
+            return
+        size = self._trail[level]
+        self._phases.save(size, self._trail[self._level-1], self._size)
+        del self._trail[level:]
+        value = self._value
+        for a in self._known[size:self._size]:
+            value[2*a] = value[2*a+1] = UNDEF
+        self._heuristic.reinsert(self._known[size:self._size])
+        self._size = size
+        self._unpropagated = size
+        self._level = level
     
     def generate(self, conf_limit=-1):
         """
-        standard cdcl search, stops when the limit on the number of conflict is reached or when all atoms are in the belief base
+        standard cdcl search, stops when the limit on the number of conflict is reached, when the restart strategy says so, or when all atoms are in the belief base
         """
         outcome = UNDEF
-        while outcome == UNDEF and (conf_limit<0 or conf_limit>self.num_conflict.getValue()):
+        restart = False
+        while outcome == UNDEF and not restart and (conf_limit<0 or conf_limit>self._num_conflict):
             conflict = self.unitPropagate()
-            if (VERBOSE&DBG_SEARCH)>0:
-                print ''.join([' ' for i in range(self._level)]), 
-                for a in range(self._num_atoms):
-                    if self.atom_truth(a) != UNDEF:
-                        print lit_to_str(literal(a, self._truth[a])),
-                print
-            
             if conflict == None:
-                if (CHECKED&CHK_PROPAG)>0:
-                    self.checkUnitPropag()
-                if self.num_choices() == 0:
+                if self._level < len(self._assumptions):
+                    # the assumptions are decided first, one per level (the level is empty if the assumption is already true)
+                    p = self._assumptions[self._level]
+                    if self._value[p] == FALSE:
+                        self._failed = p
+                        outcome = FALSE
+                    else:
+                        self.save()
+                        if self._value[p] == UNDEF:
+                            self.infer(p)
+                elif self.num_choices() == 0:
                     outcome = TRUE
                 else:
                     self.save()
                     decision = self.mostActiveAtomRand() #self.mostActiveAtom() #self.nextAtom()
-                    l = literal(decision, self._truth[decision])
+                    l = literal(decision, self._phases.polarity(decision))
                     self.infer(l)
-                    self.num_choice += 1
+                    self._num_choice += 1
             elif self._level == 0:
                 outcome = FALSE
             else:
-                backtracks, nogood = self.learnFrom(conflict)
-                for i in range(backtracks):
-                    self.undo()
-                self.store(nogood)
-                self.num_conflict += 1
-
-        if (VERBOSE&DBG_SEARCH)>0:
-            print outcome
-            
-        if (CHECKED&CHK_SOLUTION)>0 and outcome == TRUE:
-            self.checkSolution()     
+                backtracks, nogood, lbd = self.learnFrom(conflict)
+                restart = self._restarter.conflict(lbd, self._size)
+                self.backtrackTo(self._level-backtracks)
+                self.store(nogood, lbd)
+                self._heuristic.decay()
+                self._num_conflict += 1
+                if self._num_conflict >= self._next_reduce:
+                    self._reduce_interval += self._reduce_increment
+                    self._next_reduce += self._reduce_interval
+                    self.forget()
+                if self._rephase_interval > 0 and self._num_conflict >= self._next_rephase:
+                    self._next_rephase += self._rephase_interval
+                    self._phases.rephase()
+                if self._progress != None:
+                    self._progress.conflict()
+                if self._deadline != None and time.time() >= self._deadline:
+                    # stops as for a restart, restartSearch then gives up
+                    restart = True
         return outcome
              
 
@@ -563,75 +964,91 @@ class Solver(ClauseBase,BeliefBase):
     def unitPropagate(self):
         """
         unit propagation, returns the conflicting clause if there is one and None otherwise
+        the conflicting clause is either the offset of a clause or a pair of literals (binary clause)
         """
         conflict = None
-        # while self._unpropagated < len(self._fact) and conflict == None:
+        start = self._unpropagated
         while self._unpropagated < self._size and conflict == None:
-            # a = self._fact[self._unpropagated]
             a = self._known[self._unpropagated]
-            if (VERBOSE&DBG_PROPAG)>0:
-                print 'unit propagate', lit_to_str(literal(a, self._truth[a]))
-                
             conflict = self.update(opposite(literal(a, self._truth[a])))
-            if (CHECKED&CHK_WATCHED)>0:
-                self.checkWatchedLiterals()
-            
             self._unpropagated += 1
-            self.num_propag += 1
+        self._num_propag += self._unpropagated - start
 
         return conflict
         
     def update(self,old_watched):
         """
         update the watcheds when the literal old_watched becomes false
+        the watch list is compacted in place: entries of deactivated clauses are dropped, entries of clauses that do not watch old_watched anymore are moved to the list of their new watched
         """
-        cl_idx = len(self._watcher_of[old_watched])-1
+        value = self._value
+        
+        # binary clauses: propagate directly from the implication list
+        for q in self._binary_of[old_watched]:
+            valq = value[q]
+            if valq == UNDEF:
+                self.infer(q, ~old_watched)
+            elif valq == FALSE:
+                return (q, old_watched)
+        
+        arena = self._arena
+        watches = self._watcher_of[old_watched]
+        end = len(watches)
         conflict = None
-        for k in reversed(self._watcher_of[old_watched]):
-            if self._status[k] == TO_DEACTIVATE:
-                self._remove_watcher_(old_watched,cl_idx)
-            else:
-            
-                clause = self._clauses[k]
-                
-                # conflict = None if clause.propagate(self,old_watched,k,cl_idx) else clause
-
-                # second = 0 if atom(old_watched) == atom(clause[1]) else 1
-                second = 0 if atom(old_watched) == atom(clause[1]) else 1
-                other_watched = clause[second]
-
-                # check that the second watched is not known
-                valo = self.lit_truth(other_watched)
-
-                if valo != TRUE:
-                    # look for a new watched to replace watched
-                    new_watched = None
-                    valn = UNDEF
-                    j = len(clause)
-                    while new_watched == None and j>2:
-                        j -= 1
-                        valn = self.lit_truth(clause[j])
-
-                        if valn != FALSE:
-                            # ok, we found a new watched
-                            new_watched = clause[j]
-                            clause[1-second] = new_watched
-                            clause[j] = old_watched
-                            # self._watcher_of[old_watched].pop(cl_idx) # we don't do that here
-                            self._watcher_of[new_watched].append(k)
-                            self._remove_watcher_(old_watched,cl_idx)
-
-                    if new_watched == None:
-                        # we could not find a new watched, so we prune 'second_watched'
-                        # print '  there is no new watcher',
-                        # new_watch_list.append(k)
-                        if valo == FALSE:
-                            conflict = clause
-                        else:
-                            self.infer(other_watched, clause)
-            cl_idx -= 1
-            if conflict != None:
-                break
+        i = j = 0
+        while i < end and conflict == None:
+            k = watches[i]
+            blocker = watches[i+1]
+            i += 2
+            if arena[k]&STATUS == TO_DEACTIVATE:
+                continue
+
+            # the clause is satisfied by its blocker, no need to look at it
+            if value[blocker] == TRUE:
+                watches[j] = k
+                watches[j+1] = blocker
+                j += 2
+                continue
+
+            # make sure that old_watched is the second literal
+            first = k+2
+            if arena[first] == old_watched:
+                arena[first] = arena[first+1]
+                arena[first+1] = old_watched
+            other_watched = arena[first]
+
+            # check that the second watched is not known
+            valo = value[other_watched]
+
+            if valo != TRUE:
+                # look for a new watched to replace watched
+                new_watched = None
+                n = first+arena[k+1]
+                while new_watched == None and n>first+2:
+                    n -= 1
+                    if value[arena[n]] != FALSE:
+                        # ok, we found a new watched
+                        new_watched = arena[n]
+                        arena[first+1] = new_watched
+                        arena[n] = old_watched
+                        self._watcher_of[new_watched].extend((k, other_watched))
+
+                if new_watched != None:
+                    continue
+
+                # we could not find a new watched, so we prune 'other_watched'
+                if valo == FALSE:
+                    conflict = k
+                else:
+                    self.infer(other_watched, k)
+
+            # the clause still watches old_watched, other_watched is a good blocker
+            watches[j] = k
+            watches[j+1] = other_watched
+            j += 2
+
+        # remove the entries that were dropped or moved (the tail is kept on conflict)
+        del watches[j:i]
         return conflict
     
 
@@ -640,108 +1057,360 @@ class Solver(ClauseBase,BeliefBase):
     ################################
     def learnFrom(self, conflict):    
         """
-        analyzes conflict and returns a clause to explain it
+        analyzes conflict and returns a clause to explain it (first UIP scheme)
+        the trail is walked backward, self._seen marks the atoms that are in the clause or yet to be explained
+        the learned clause has the UIP in first position and a literal of highest level in second position
+        returns the number of levels to backjump, the learned clause and its LBD
         """
-        need_explaining = [l for l in conflict]
+        seen = self._seen
+        asg_level = self._asg_level
+        bump = self._heuristic.bump
         learned_clause = [None]
-        visited = set([])
-        max_level = 0
-        
-        if (VERBOSE&DBG_LEARNING)>0:
-            print self._str__bb_()
+        reason = conflict if isinstance(conflict, tuple) else self.useClause(conflict)
+        to_explain = 0
+        index = self._size
         
-        idx_max_lit = 0
-        while len(need_explaining)>1:
-            if (VERBOSE&DBG_LEARNING)>0:
-                print "current clause:", '('+' '.join([lit_to_str(l) for l in learned_clause[1:]])+')'
-                print "yet to explain:", '('+' '.join([lit_to_str(l)+'|'+str(self._asg_level[atom(l)]) for l in need_explaining])+')'
-            
-            l = need_explaining.pop()
-            a = atom(l)
-            
-            if (VERBOSE&DBG_LEARNING)>0:
-                print 'analyze', lit_to_str(l)
+        while True:
+            for p in reason:
+                b = atom(p)
+                if not seen[b] and asg_level[b] > 0:
+                    seen[b] = SEEN
+                    bump(b)
+                    if asg_level[b] == self._level:
+                        to_explain += 1
+                    else:
+                        learned_clause.append(p)
             
-            if not a in visited:
-                visited.add(a)
-                self.increaseActivity(a)
-                if self._asg_level[a] < self._level:
-                    if (VERBOSE&DBG_LEARNING)>0:
-                        print '  no need to explain'
-                    if self._asg_level[a] > max_level:
-                        max_level = self._asg_level[a]
-                        idx_max_lit = len(learned_clause)
-                    learned_clause.append(opposite(literal(a,self._truth[a])))
-                elif self._reason[a] == None:
-                    if (VERBOSE&DBG_LEARNING)>0:
-                        print '  last decision'
-                    need_explaining.insert(0,l)
-                else:
-                    if (VERBOSE&DBG_LEARNING)>0:
-                        print '  explain by', [lit_to_str(p) for p in self._reason[a] if atom(p) != a and atom(p) not in visited]
-                    need_explaining.extend([p for p in self._reason[a] if atom(p) != a and atom(p) not in visited])
+            # the next atom to explain is the last one of the trail marked as seen
+            index -= 1
+            while not seen[self._known[index]]:
+                index -= 1
+            a = self._known[index]
+            seen[a] = 0
+            to_explain -= 1
+            if to_explain == 0:
+                break
+                
+            reason = self._reason[a]
+            if reason < 0:
+                reason = (~reason,)
             else:
-                if (VERBOSE&DBG_LEARNING)>0:
-                    print 'already explained'
+                reason = self.useClause(reason)[1:]
                 
-        a = atom(need_explaining[0])
-        learned_clause[0] = opposite(literal(a,self._truth[a])) 
-        # if idx_max_lit > 1:
-        # learned_clause[1], learned_clause[idx_max_lit] = learned_clause[idx_max_lit], learned_clause[1]
+        learned_clause[0] = opposite(literal(a,self._truth[a]))
+        
+        if self._minimization != MIN_NONE:
+            self.minimize(learned_clause)
+        
+        max_level = 0
+        for i in range(1, len(learned_clause)):
+            b = atom(learned_clause[i])
+            seen[b] = 0
+            if asg_level[b] > max_level:
+                max_level = asg_level[b]
+                learned_clause[1], learned_clause[i] = learned_clause[i], learned_clause[1]
          
-        if (VERBOSE&DBG_LEARNING)>0:
-            print 'learned', [lit_to_str(l) for l in learned_clause]
-            print 'backjump', (self._level - max_level), 'levels'
+        lbd = self.computeLBD(learned_clause)
+        
+        return (self._level - max_level), learned_clause, lbd
+        
+    def useClause(self, k):
+        """
+        the clause at offset k takes part in a conflict analysis: if it is learnt, it is marked as USED and its LBD is updated (and it is counted as used if it was IMPORTED)
+        returns its literals
+        """
+        arena = self._arena
+        literals = arena[k+2:k+2+arena[k+1]]
+        header = arena[k]
+        if header&LEARNT:
+            if header>>LBD_SHIFT > self._core_lbd:
+                lbd = self.computeLBD(literals)
+                if lbd < header>>LBD_SHIFT:
+                    header = (header&HEADER_FLAGS) | (lbd<<LBD_SHIFT)
+            if header&IMPORTED:
+                header &= ~IMPORTED
+                self._num_imported_used += 1
+            arena[k] = header|USED
+        return literals
+        
+    def computeLBD(self, literals):
+        """
+        returns the literal block distance of the literals, i.e., the number of distinct levels among them
+        """
+        self._stamp += 1
+        stamp = self._stamp
+        level_stamp = self._level_stamp
+        asg_level = self._asg_level
+        lbd = 0
+        for p in literals:
+            l = asg_level[atom(p)]
+            if level_stamp[l] != stamp:
+                level_stamp[l] = stamp
+                lbd += 1
+        return lbd
+        
+    def explanation(self, a):
+        """
+        returns the literals of the reason of the (implied) atom a, except the literal of a itself: they are all false
+        the implied literal is always the first of its reason clause
+        """
+        reason = self._reason[a]
+        if reason < 0:
+            return (~reason,)
+        return self._arena[reason+3:reason+2+self._arena[reason+1]]
+        
+    def minimize(self, clause):
+        """
+        removes the redundant literals of a learned clause, i.e., those that are implied by the other literals of the clause
+        - MIN_LOCAL: every other literal of the reason is in the clause
+        - MIN_RECURSIVE: every other literal of the reason is in the clause or, recursively, redundant
+        the atoms of clause[1:] must be marked as SEEN, the atoms found REDUNDANT or REQUIRED are cached in self._seen, all the marks are cleared on exit
+        """
+        seen = self._seen
+        asg_level = self._asg_level
+        marked = [atom(p) for p in clause[1:]]
+        abstract_levels = 0
+        for a in marked:
+            abstract_levels |= 1 << (asg_level[a] & 31)
+        
+        j = 1
+        for i in range(1, len(clause)):
+            a = atom(clause[i])
+            if self._reason[a] == None:
+                redundant = False
+            elif self._minimization == MIN_RECURSIVE:
+                redundant = self.litRedundant(a, abstract_levels, marked)
+            else:
+                redundant = True
+                for q in self.explanation(a):
+                    if seen[atom(q)] != SEEN and asg_level[atom(q)] > 0:
+                        redundant = False
+                        break
+            if not redundant:
+                clause[j] = clause[i]
+                j += 1
+                
+        self._num_minimized += len(clause) - j
+        del clause[j:]
+        for a in marked:
+            seen[a] = 0
+        
+    def litRedundant(self, a, abstract_levels, marked):
+        """
+        whether the atom a is implied by the atoms marked as SEEN (depth-first exploration of the implication graph)
+        abstract_levels is a bitset of the levels in the clause: an atom whose level is not in this set cannot be redundant
+        atoms marked as REDUNDANT or REQUIRED are appended to marked
+        """
+        seen = self._seen
+        asg_level = self._asg_level
+        top = len(marked)
+        stack = [a]
+        while len(stack) > 0:
+            for q in self.explanation(stack.pop()):
+                b = atom(q)
+                if seen[b] == SEEN or seen[b] == REDUNDANT or asg_level[b] == 0:
+                    continue
+                if seen[b] == 0 and self._reason[b] != None and (1 << (asg_level[b] & 31)) & abstract_levels:
+                    seen[b] = REDUNDANT
+                    marked.append(b)
+                    stack.append(b)
+                else:
+                    # b is required, the atoms explored from a are not known to be redundant anymore
+                    for c in marked[top:]:
+                        seen[c] = 0
+                    del marked[top:]
+                    if seen[b] == 0:
+                        seen[b] = REQUIRED
+                        marked.append(b)
+                    return False
+        return True
+        
+    def store(self, nogood, lbd):
+        """
+        stores a new learned clause, in the tier of its LBD, and 'unit propagate' it
+        """
+        if self._proof != None:
+            self._proof.add(nogood)
+        if self._exchange != None and self._exchange.export(nogood, lbd):
+            self._num_exported += 1
+        if len(nogood)==2:
+            self._add_binary_(nogood[0], nogood[1])
+            self._num_learnt_binaries += 1
+            reason = ~nogood[1]
+        elif len(nogood)>2:
+            reason = self._unchecked_add_(nogood, ACTIVE|LEARNT|(lbd<<LBD_SHIFT))
+            self.classify(reason, lbd)
+        else:
+            reason = self._allocate_(nogood, INACTIVE)
+        self.infer(nogood[0], reason)
+        
+    def classify(self, k, lbd):
+        """
+        puts the learned clause at offset k in the tier of its LBD
+        """
+        if lbd <= self._core_lbd:
+            self._core.append(k)
+        elif lbd <= self._tier2_lbd:
+            self._tier2.append(k)
+        else:
+            self._learnts.append(k)
+        
+    def locked(self, k):
+        """
+        whether the clause at offset k is the reason of the current assignment of its first literal
+        """
+        a = atom(self._arena[k+2])
+        return self.known(a) and self._reason[a] == k
+        
+    def collectGarbage(self):
+        """
+        reclaims the space of deactivated clauses, and updates the reasons to the new offsets
+        Warning: the reasons must not point to deactivated clauses (locked clauses are never forgotten)
+        """
+        relocation = ClauseBase.collectGarbage(self)
+        for a in self._known[:self._size]:
+            reason = self._reason[a]
+            if reason != None and reason >= 0:
+                self._reason[a] = relocation[reason]
+        
+    def forget(self):
+        """
+        reduces the learned clause database (every _reduce_interval conflicts, the interval grows by _reduce_increment)
+        - core clauses (LBD <= _core_lbd) are kept forever
+        - tier-2 clauses (LBD <= _tier2_lbd) are kept as long as they are used between two reductions, otherwise they move to the local tier
+        - local clauses that were used since the last reduction are kept, the fraction _forgetfulness of the other ones, with highest LBD, is forgotten
+        the LBD of a clause may decrease when it is used, in which case it moves to a better tier
+        """
+        arena = self._arena
+        tier2 = []
+        local = []
+        for k in self._tier2:
+            if arena[k]>>LBD_SHIFT <= self._core_lbd:
+                self._core.append(k)
+            elif arena[k]&USED:
+                arena[k] &= ~USED
+                tier2.append(k)
+            else:
+                local.append(k)
+        candidates = []
+        for k in self._learnts:
+            lbd = arena[k]>>LBD_SHIFT
+            if lbd <= self._core_lbd:
+                self._core.append(k)
+            elif lbd <= self._tier2_lbd:
+                tier2.append(k)
+            elif arena[k]&USED or self.locked(k):
+                arena[k] &= ~USED
+                local.append(k)
+            else:
+                candidates.append(k)
+        
+        candidates.sort(key=lambda k: (arena[k]>>LBD_SHIFT, arena[k+1]))
+        keep = len(candidates) - int(self._forgetfulness * len(candidates))
+        proof = self._proof
+        for k in candidates[keep:]:
+            self.deactivateClause(k)
+            if proof != None:
+                proof.delete(arena[k+2:k+2+arena[k+1]])
+        local.extend(candidates[:keep])
+        self._tier2 = tier2
+        self._learnts = local
             
             
-        # if len(self._clauses) == 1055:
-        #     print Clause(learned_clause)
-        #     sys.exit(1)
+    ################################
+    ########    LOOKAHEAD   ########
+    ################################
+    def lookahead(self, p):
+        """
+        decides p at a new level and propagates it, then backtracks
+        returns the number of atoms inferred (p included), or -1 if propagation fails
+        """
+        level = self._level
+        size = self._size
+        self.save()
+        self.infer(p)
+        conflict = self.unitPropagate()
+        inferred = self._size - size
+        self.backtrackTo(level)
+        return -1 if conflict != None else inferred
         
-        return (self._level - max_level), learned_clause
+    def split(self, cube=[], depth=1, max_candidates=32):
+        """
+        lookahead splitting: returns a list of cubes (lists of literals, each extending cube) such that every model extending cube extends one of them
+        the tree of cubes is depth decisions deep (or less if the clauses are satisfied earlier), the cubes refuted by unit propagation are left out (cube is inconsistent if the list is empty)
+        the search is done from level 0, with one level per literal of cube, and the solver is back at level 0 afterward, with the phases it had before the split
+        the decisions are taken among the atoms of the instance that occur in some clause
+        """
+        self.backtrackTo(0)
+        if self._heuristic == None:
+            self.initActivity()
+        phases = self._phases.snapshot()
+        atoms = set(atom(p) for clause in self.clauses() for p in clause)
+        atoms = [a for a in atoms if a < self._num_variables]
+        cubes = []
+        if self.unitPropagate() == None:
+            for p in cube:
+                self.save()
+                if self._value[p] == FALSE:
+                    break
+                elif self._value[p] == UNDEF:
+                    self.infer(p)
+                    if self.unitPropagate() != None:
+                        break
+            else:
+                self._split_(list(cube), depth, atoms, max_candidates, cubes)
+        self.backtrackTo(0)
+        self._phases.restore(phases)
+        return cubes
         
-    def store(self,nogood):
+    def _split_(self, cube, depth, atoms, max_candidates, cubes):
         """
-        stores a new learned clause and 'unit propagate' it
+        appends to cubes the extensions of cube (the current, propagated, node) by depth decisions
+        the decision is the atom whose two literals infer the most atoms (product of the two counts, plus their sum), among the max_candidates free atoms of highest score (for the branching heuristic) in atoms
+        a literal whose propagation fails is a failed literal: its opposite is inferred at the current level (as a learned unit at level 0) and added to the cube
         """
-        clause = Clause(nogood)
-        if len(nogood)>1:
-            self._learnts.append(len(self._clauses))
-            self._unchecked_add_(clause)
-        self.infer(clause[0], clause)
-        
-    def score(self, clause):
-        """
-        returns an activity-based score for a clause
-        """
-        return sum([self._activity[atom(l)] for l in clause])/(len(clause) * len(clause))
-
-    def forget(self, forgetfulness=0.6):
-        """
-        forgets every clause which score is below the "mean" (biased by forgetfulness in [0..1]) i.e.,
-        - forgetfulness = 0: forgets nothing
-        - forgetfulness = 1: forgets everything
-        - forgetfulness = .5: forgets every clause which score is below average
-        """
-        scores = [self.score(self._clauses[c]) for c in self._learnts]
-        visited = len(scores)-1        
-        max_sc = max(scores)
-        min_sc = min(scores)
-        gap = max_sc - min_sc
-        threshold = min_sc + forgetfulness * gap
-        
-        #invariant: the list learnts[:visited+1] has not been visited
-        #           the list learnts[visited+1:] should be kept
-        swap = False
-        while visited>=0:
-            # put the first non visited element at the back
-            if swap:
-                self._learnts[visited], self._learnts[-1] = self._learnts[-1], self._learnts[visited]
-            # check if should keep or remove it
-            if scores[visited]<threshold:
-                self.deactivateClause(self._learnts.pop())
-                swap = True
-            visited -= 1
+        if depth == 0:
+            cubes.append(cube)
+            return
+        # the candidates are evaluated again if the failed literals inferred the best one
+        while True:
+            free = [a for a in atoms if not self.known(a)]
+            if len(free) == 0:
+                cubes.append(cube)
+                return
+            best, best_score, failed = None, -1, False
+            for a in heapq.nlargest(max_candidates, free, key=self._heuristic.score):
+                if self.known(a):
+                    continue
+                positive = self.lookahead(literal(a, TRUE))
+                negative = self.lookahead(literal(a, FALSE))
+                if positive < 0 and negative < 0:
+                    return
+                elif positive < 0 or negative < 0:
+                    p = literal(a, TRUE if negative < 0 else FALSE)
+                    if self._level == 0:
+                        self.store([p], 1)
+                    else:
+                        self.infer(p)
+                        cube = cube+[p]
+                    if self.unitPropagate() != None:
+                        return
+                    failed = True
+                elif positive*negative + positive + negative > best_score:
+                    best, best_score = a, positive*negative + positive + negative
+            if best != None and not self.known(best):
+                break
+            if not failed:
+                cubes.append(cube)
+                return
+        level = self._level
+        for t in (TRUE, FALSE):
+            p = literal(best, t)
+            self.save()
+            self.infer(p)
+            if self.unitPropagate() == None:
+                self._split_(cube+[p], depth-1, atoms, max_candidates, cubes)
+            self.backtrackTo(level)
             
             
     ################################
@@ -754,11 +1423,11 @@ class Solver(ClauseBase,BeliefBase):
         # for a in range(self._num_atoms):
         #     print lit_to_str(literal(a, self._truth[a]),''), 0
         cl_idx = 0       
-        for cl in self._clauses:
+        for cl in self.clauses():
             satisfied = False
             false_literals = set([])
             if (VERBOSE&DBG_CHECK)>0:
-                print cl
+                print Clause(cl)
             for l in cl:
                 if self.lit_truth(l) == TRUE:
                     if l in false_literals:
@@ -766,12 +1435,12 @@ class Solver(ClauseBase,BeliefBase):
                         sys.exit(1)
                     false_literals.add(opposite(l))
                     if (VERBOSE&DBG_CHECK)>0:
-                        print lit_to_str(l), 'satisfies c'+str(cl_idx), cl
+                        print lit_to_str(l), 'satisfies c'+str(cl_idx), Clause(cl)
                     satisfied = True
                     break
             if not satisfied:
                 # if (VERBOSE&DBG_CHECK)>0:
-                print 'solution does not satisfy c'+str(cl_idx), cl
+                print 'solution does not satisfy c'+str(cl_idx), Clause(cl)
                 return False
             cl_idx += 1
                 
@@ -792,7 +1461,7 @@ class Solver(ClauseBase,BeliefBase):
         check that unit propagation is complete
         """
         cl_idx = 0
-        for clause in self._clauses:
+        for clause in self.clauses():
             undef = None
             for l in clause:
                 if self.lit_truth(l) == UNDEF:
@@ -805,7 +1474,7 @@ class Solver(ClauseBase,BeliefBase):
                     undef = None
                     break
             if undef != None:
-                print 'c'+str(cl_idx), clause, [truth_to_str(self.lit_truth(l)) for l in clause], '=>', lit_to_str(undef), 'should be propagated'
+                print 'c'+str(cl_idx), Clause(clause), [truth_to_str(self.lit_truth(l)) for l in clause], '=>', lit_to_str(undef), 'should be propagated'
                 sys.exit(1)
             cl_idx += 1
         if (VERBOSE&DBG_CHECK)>0:
@@ -818,9 +1487,9 @@ class Solver(ClauseBase,BeliefBase):
         for a in range(self._num_atoms):
             for spin in (0,1):
                 l = literal(a,spin)
-                for k in self._watcher_of[l]:
-                    if self._clauses[k][0] != l and self._clauses[k][1] != l:
-                        print 'c'+str(k), self._clauses[k], 'watches a wrong literal:', l
+                for k in self._watcher_of[l][::2]:
+                    if self._arena[k+2] != l and self._arena[k+3] != l:
+                        print 'c'+str(k), self.clause(k), 'watches a wrong literal:', l
                         sys.exit(1)
         if (VERBOSE&DBG_CHECK)>0:
             print 'watched literal struct OK'
@@ -836,10 +1505,18 @@ class Solver(ClauseBase,BeliefBase):
             p = literal(a, self._truth[a])
             ostr += lit_to_str(p)
             if self._reason[a] != None:
-                ostr += ' because of '+str(self._reason[a])
+                ostr += ' because of '+self._str_reason_(a)
             ostr += '\n'
         return ostr + ']'
         
+    def _str_reason_(self, a):
+        reason = self._reason[a]
+        if reason == None:
+            return 'None'
+        elif reason < 0:
+            return str(Clause((literal(a, self._truth[a]), ~reason)))
+        return str(self.clause(reason))
+        
     def _str__bb_(self): 
         ostr = ''
         rank = 1
@@ -848,42 +1525,548 @@ class Solver(ClauseBase,BeliefBase):
         for a in self._known[:self._size]:
             while not self.known(cura):
                 cura += 1
-            ostr += str(cura+1).rjust(3)+' '+str(self._index[cura]+1).rjust(3)+' '+str(self._asg_level[cura]).rjust(3)+' '+str(self._reason[cura]).ljust(30)+' | '
+            ostr += str(cura+1).rjust(3)+' '+str(self._index[cura]+1).rjust(3)+' '+str(self._asg_level[cura]).rjust(3)+' '+self._str_reason_(cura).ljust(30)+' | '
             cura += 1
             p = literal(a, self._truth[a])
             ostr += str(rank).rjust(3)+' '+str(self._asg_level[a]).rjust(3)+' '+lit_to_str(p).rjust(4)
             if self._reason[a] != None:
-                ostr += ' '+str(self._reason[a])
+                ostr += ' '+self._str_reason_(a)
             ostr += '\n'
             rank += 1
         return ostr 
         
 
+################################
+#####  INSTRUMENTED SOLVER  ####
+################################
+class InstrumentedSolver(Solver):
+    """
+    Solver whose search loop prints traces (according to VERBOSE) and checks its invariants (according to CHECKED), for debugging
+    Solver itself contains none of these tests in its hot paths
+    """
+    def mostActiveAtom(self):
+        a = Solver.mostActiveAtom(self)
+        if (VERBOSE&DBG_ACTIVITY)>0:
+            print 'most active atom', (a+1)
+        return a
+        
+    def infer(self, p, reason=None):
+        Solver.infer(self, p, reason)
+        if (VERBOSE&DBG_SEARCH)>0 or (VERBOSE&DBG_LEARNING)>0:
+            print ''.join([' ' for i in range(self._level)]), 'infer', lit_to_str(p), '(reason='+str(reason)+') ['+str(self._level)+']'
+
+    def generate(self, conf_limit=-1):
+        """
+        Solver.generate, with traces and checks
+        """
+        if (VERBOSE&DBG_SEARCH)>0:
+            self.cpu_time.update()
+            print 'restart with %s -- %s -- %s'%(self._restarter, self.num_conflict, self.cpu_time)
+        outcome = UNDEF
+        restart = False
+        while outcome == UNDEF and not restart and (conf_limit<0 or conf_limit>self._num_conflict):
+            conflict = self.unitPropagate()
+            if (VERBOSE&DBG_SEARCH)>0:
+                print ''.join([' ' for i in range(self._level)]), 
+                for a in range(self._num_atoms):
+                    if self.atom_truth(a) != UNDEF:
+                        print lit_to_str(literal(a, self._truth[a])),
+                print
+            
+            if conflict == None:
+                if (CHECKED&CHK_PROPAG)>0:
+                    self.checkUnitPropag()
+                if self._level < len(self._assumptions):
+                    p = self._assumptions[self._level]
+                    if self._value[p] == FALSE:
+                        self._failed = p
+                        outcome = FALSE
+                    else:
+                        self.save()
+                        if self._value[p] == UNDEF:
+                            self.infer(p)
+                elif self.num_choices() == 0:
+                    outcome = TRUE
+                else:
+                    self.save()
+                    decision = self.mostActiveAtomRand() #self.mostActiveAtom() #self.nextAtom()
+                    l = literal(decision, self._phases.polarity(decision))
+                    self.infer(l)
+                    self._num_choice += 1
+            elif self._level == 0:
+                outcome = FALSE
+            else:
+                backtracks, nogood, lbd = self.learnFrom(conflict)
+                restart = self._restarter.conflict(lbd, self._size)
+                self.backtrackTo(self._level-backtracks)
+                self.store(nogood, lbd)
+                self._heuristic.decay()
+                self._num_conflict += 1
+                if self._num_conflict >= self._next_reduce:
+                    self._reduce_interval += self._reduce_increment
+                    self._next_reduce += self._reduce_interval
+                    self.forget()
+                if self._rephase_interval > 0 and self._num_conflict >= self._next_rephase:
+                    self._next_rephase += self._rephase_interval
+                    self._phases.rephase()
+                if self._progress != None:
+                    self._progress.conflict()
+                if self._deadline != None and time.time() >= self._deadline:
+                    # stops as for a restart, restartSearch then gives up
+                    restart = True
+
+        if (VERBOSE&DBG_SEARCH)>0:
+            print outcome
+            
+        if (CHECKED&CHK_SOLUTION)>0 and outcome == TRUE:
+            self.checkSolution()     
+        return outcome
+
+    def unitPropagate(self):
+        """
+        Solver.unitPropagate, with traces and checks
+        """
+        conflict = None
+        while self._unpropagated < self._size and conflict == None:
+            a = self._known[self._unpropagated]
+            if (VERBOSE&DBG_PROPAG)>0:
+                print 'unit propagate', lit_to_str(literal(a, self._truth[a]))
+                
+            conflict = self.update(opposite(literal(a, self._truth[a])))
+            if (CHECKED&CHK_WATCHED)>0:
+                self.checkWatchedLiterals()
+            
+            self._unpropagated += 1
+            self._num_propag += 1
+
+        return conflict
+
+    def learnFrom(self, conflict):    
+        """
+        Solver.learnFrom, with traces
+        """
+        seen = self._seen
+        asg_level = self._asg_level
+        bump = self._heuristic.bump
+        learned_clause = [None]
+        reason = conflict if isinstance(conflict, tuple) else self.useClause(conflict)
+        to_explain = 0
+        index = self._size
+        
+        if (VERBOSE&DBG_LEARNING)>0:
+            print self._str__bb_()
+        
+        while True:
+            if (VERBOSE&DBG_LEARNING)>0:
+                print '  explain by', [lit_to_str(p) for p in reason]
+            
+            for p in reason:
+                b = atom(p)
+                if not seen[b] and asg_level[b] > 0:
+                    seen[b] = SEEN
+                    bump(b)
+                    if asg_level[b] == self._level:
+                        to_explain += 1
+                    else:
+                        learned_clause.append(p)
+            
+            # the next atom to explain is the last one of the trail marked as seen
+            index -= 1
+            while not seen[self._known[index]]:
+                index -= 1
+            a = self._known[index]
+            seen[a] = 0
+            to_explain -= 1
+            if to_explain == 0:
+                break
+                
+            if (VERBOSE&DBG_LEARNING)>0:
+                print 'analyze', lit_to_str(literal(a,self._truth[a]))
+                
+            reason = self._reason[a]
+            if reason < 0:
+                reason = (~reason,)
+            else:
+                reason = self.useClause(reason)[1:]
+                
+        learned_clause[0] = opposite(literal(a,self._truth[a]))
+        
+        if self._minimization != MIN_NONE:
+            self.minimize(learned_clause)
+        
+        max_level = 0
+        for i in range(1, len(learned_clause)):
+            b = atom(learned_clause[i])
+            seen[b] = 0
+            if asg_level[b] > max_level:
+                max_level = asg_level[b]
+                learned_clause[1], learned_clause[i] = learned_clause[i], learned_clause[1]
+         
+        lbd = self.computeLBD(learned_clause)
+         
+        if (VERBOSE&DBG_LEARNING)>0:
+            print 'learned', [lit_to_str(l) for l in learned_clause], 'lbd='+str(lbd)
+            print 'backjump', (self._level - max_level), 'levels'
+        
+        return (self._level - max_level), learned_clause, lbd
+
+    def minimize(self, clause):
+        literals = list(clause)
+        Solver.minimize(self, clause)
+        if (VERBOSE&DBG_LEARNING)>0:
+            print 'minimized', [lit_to_str(l) for l in literals if l not in clause]
+
+################################
+#######  PROFILED SOLVER  ######
+################################
+class ProfiledSolver(Solver):
+    """
+    Solver that measures the wall time spent in each phase of the search (propagation, analysis, decision, reduction and restarts) and the number of watches visited
+    the time of a phase excludes the time of the phases it calls, the rest of the search time is counted as 'other'
+    a visit is an entry of a watch list (or of a list of binary clauses) of a literal that becomes false, including the entries after a conflict that are not actually looked at
+    """
+    def __init__(self, n=DEFAULT_SIZE):
+        Solver.__init__(self, n)
+        self._phase_time   = dict((phase, 0.0) for phase in PROFILED_PHASES)
+        self._search_time  = 0.0
+        self._watch_visits = 0
+        
+    def _timed_(self, phase, method, *args):
+        start = time.time()
+        reduction = self._phase_time['reduction']
+        result = method(self, *args)
+        self._phase_time[phase] += time.time() - start - (self._phase_time['reduction'] - reduction)
+        return result
+        
+    def restartSearch(self, limit=-1):
+        start = time.time()
+        outcome = Solver.restartSearch(self, limit)
+        self._search_time += time.time() - start
+        return outcome
+        
+    def unitPropagate(self):
+        return self._timed_('propagation', Solver.unitPropagate)
+        
+    def update(self, old_watched):
+        self._watch_visits += len(self._binary_of[old_watched]) + len(self._watcher_of[old_watched])/2
+        return Solver.update(self, old_watched)
+        
+    def learnFrom(self, conflict):
+        return self._timed_('analysis', Solver.learnFrom, conflict)
+        
+    def mostActiveAtomRand(self):
+        return self._timed_('decision', Solver.mostActiveAtomRand)
+        
+    def forget(self):
+        return self._timed_('reduction', Solver.forget)
+        
+    def collectGarbage(self):
+        return self._timed_('reduction', Solver.collectGarbage)
+        
+    def restart(self):
+        return self._timed_('restarts', Solver.restart)
+        
+    def getProfile(self):
+        """
+        returns the profile as a dictionary (times are in seconds)
+        """
+        num_propag = self._num_propag
+        phase_time = dict(self._phase_time)
+        phase_time['other'] = self._search_time - sum(self._phase_time.values())
+        return {'search_time':self._search_time, 'phase_time':phase_time, 'propagations':num_propag, 'conflicts':self._num_conflict, 'decisions':self._num_choice, 'restarts':self._num_restart, 'watch_visits':self._watch_visits, 'watch_visits_per_propagation':float(self._watch_visits)/max(num_propag, 1)}
+
+
+################################
+########    PORTFOLIO   ########
+################################
+def configure(solver, forget=.5, random=.05, seed=12345, branching='vsids', phase='saved', rephase=0, restart='luby', reuse_trail=False, minimize='recursive', preprocess=False):
+    """
+    sets the parameters of the solver (before the search), the values are those of the command line options
+    """
+    solver._forgetfulness = forget
+    solver._branching = {'vsids':EVSIDS, 'vmtf':VMTF}[branching]
+    solver._phase_policy = {'saved':PHASE_SAVED, 'true':PHASE_TRUE, 'false':PHASE_FALSE, 'target':PHASE_TARGET, 'best':PHASE_BEST}[phase]
+    solver._rephase_interval = rephase
+    solver._restart_strategy = {'geometric':Geometric, 'luby':Luby, 'glucose':Glucose}[restart]
+    solver._reuse_trail = reuse_trail
+    solver._preprocessing = preprocess
+    solver._minimization = {'none':MIN_NONE, 'local':MIN_LOCAL, 'recursive':MIN_RECURSIVE}[minimize]
+    solver.setRandom(random, seed)
+
+
+def portfolioConfigurations(n, base={}):
+    """
+    returns n different settings (keyword arguments of configure()): the first one is base, the i-th one changes the restart strategy, the branching heuristic, the phases, the forgetfulness, the randomness and the seed of base, following i
+    """
+    restarts   = ['luby', 'glucose', 'geometric']
+    branchings = ['vsids', 'vmtf']
+    phases     = [('saved', 0), ('target', 1000), ('best', 2000), ('false', 0)]
+    forgets    = [.5, .3, .7]
+    randoms    = [.05, .02, .1, .01]
+    configurations = []
+    for i in range(n):
+        config = dict(base)
+        if i > 0:
+            config['restart'] = restarts[i%3]
+            config['branching'] = branchings[(i/3)%2]
+            config['phase'], config['rephase'] = phases[(i/6)%4]
+            config['forget'] = forgets[(i/2)%3]
+            config['random'] = randoms[(i/5)%4]
+            config['seed'] = config.get('seed', 12345) + i
+        configurations.append(config)
+    return configurations
+
+
+def _portfolioWorker_(solver, index, config, answers, exchange):
+    """
+    solves with the given setting (in a child process) and puts (index, outcome, model, statistics) in the queue answers, or (index, UNDEF, None, traceback) if the search raised an exception
+    """
+    try:
+        configure(solver, **config)
+        if exchange != None:
+            exchange.attach(index)
+            solver._exchange = exchange
+        outcome = solver.restartSearch()
+        answers.put((index, outcome, solver.model(), solver.getStatistics()))
+    except Exception:
+        answers.put((index, UNDEF, None, traceback.format_exc()))
+
+
+def solvePortfolio(solver, configurations, timeout=None, exchange=None):
+    """
+    solves the clauses of solver (which must not have searched yet) with one process per setting in configurations, the processes are forked after the instance is loaded, so it is read only once
+    if exchange is not None (a sharing.ClauseExchange), the processes share their short learned clauses through it, the preprocessing (if the first setting asks for it) is then done before forking, so that every process learns from the same clauses
+    returns (outcome, model, index, statistics, errors) where outcome, model, index and statistics come from the first process that answers TRUE or FALSE, the other processes are terminated
+    outcome is UNDEF (and model, index and statistics are None) if no process answers within timeout seconds (if not None), or if they all failed
+    errors is the list of the pairs (index, traceback) of the processes that failed before the answer, the traceback is replaced by the exit code of the processes that died without answering (killed by a signal, out of memory...)
+    """
+    if exchange != None and configurations[0].get('preprocess', False) and solver._preprocessor == None:
+        solver.preprocess()
+    answers = multiprocessing.Queue()
+    workers = [multiprocessing.Process(target=_portfolioWorker_, args=(solver, index, config, answers, exchange)) for index, config in enumerate(configurations)]
+    for worker in workers:
+        worker.daemon = True
+        worker.start()
+    deadline = None if timeout == None else time.time() + timeout
+    answer = (UNDEF, None, None, None)
+    errors = []
+    answered = set()
+    try:
+        # the queue is polled, so that the processes that die without answering are noticed
+        while len(answered) < len(workers):
+            if deadline != None and time.time() >= deadline:
+                break
+            try:
+                index, outcome, model, statistics = answers.get(timeout=1.0 if deadline == None else min(1.0, max(deadline - time.time(), 0)))
+            except Exception:
+                if not any(worker.is_alive() for worker in workers) and answers.empty():
+                    errors.extend((index, 'no answer, exit code %s\n'%worker.exitcode) for index, worker in enumerate(workers) if index not in answered)
+                    break
+                continue
+            answered.add(index)
+            if outcome != UNDEF:
+                answer = (outcome, model, index, statistics)
+                break
+            errors.append((index, statistics))
+    finally:
+        for worker in workers:
+            worker.terminate()
+        for worker in workers:
+            worker.join()
+    return answer + (errors,)
+
+
+################################
+#####  CUBE AND CONQUER  #######
+################################
+def _cubeWorker_(solver, index, tasks, results, target_time):
+    """
+    solves the cubes of the queue tasks as assumptions (in a child process) until it gets None, the learned clauses are kept from one cube to the next
+    a cube that is not solved within target_time seconds (the deadline of the solver, checked after every conflict) is split by lookahead, one decision deeper
+    puts in the queue results either (SAT, index, cube, model, statistics), (UNSAT, index, cube, whether the clauses alone are inconsistent, None) or (SPLIT, index, cube, sub-cubes, None)
+    """
+    while True:
+        cube = tasks.get()
+        if cube == None:
+            return
+        solver._deadline = time.time() + target_time
+        outcome = solver.solve(cube)
+        if outcome == TRUE:
+            results.put(('SAT', index, cube, solver.model(), solver.getStatistics()))
+        elif outcome == FALSE:
+            results.put(('UNSAT', index, cube, len(solver.core()) == 0, None))
+        else:
+            results.put(('SPLIT', index, cube, solver.split(cube, 1), None))
+
+
+def solveCubes(solver, num_workers, depth=0, target_time=10.0, timeout=None):
+    """
+    cube and conquer: the clauses of solver (which must not have searched yet) are split by lookahead into cubes, depth decisions deep (log2(num_workers)+2 if depth is 0), which are solved by num_workers processes forked after the split
+    the cubes are in a queue shared by the processes: an idle process takes the next cube, and a cube that takes more than target_time seconds is split again and its sub-cubes are queued, so the depth adapts to the hardness of the cubes
+    the preprocessing (if solver._preprocessing is set) is done before the split
+    returns (outcome, model, statistics) as soon as a cube is satisfiable, or when all cubes are refuted, the processes are then terminated
+    returns (UNDEF, None, statistics) if there is no answer within timeout seconds (if not None)
+    """
+    num_cubes  = stat.Statistic('number of cubes', 0)
+    num_splits = stat.Statistic('number of split cubes', 0)
+    if solver._preprocessing and solver._preprocessor == None:
+        solver.preprocess()
+    if depth <= 0:
+        depth = int(math.log(num_workers, 2)) + 2
+    cubes = [] if solver._inconsistent else solver.split([], depth)
+    num_cubes += len(cubes)
+    if len(cubes) == 0:
+        return FALSE, None, str(num_cubes)+'\n'+str(num_splits)
+    tasks, results = multiprocessing.Queue(), multiprocessing.Queue()
+    workers = [multiprocessing.Process(target=_cubeWorker_, args=(solver, index, tasks, results, target_time)) for index in range(num_workers)]
+    for worker in workers:
+        worker.daemon = True
+        worker.start()
+    for cube in cubes:
+        tasks.put(cube)
+    deadline = None if timeout == None else time.time() + timeout
+    answer = (UNDEF, None, None)
+    pending = len(cubes)
+    try:
+        while pending > 0:
+            try:
+                kind, index, cube, data, statistics = results.get(timeout=None if deadline == None else max(deadline - time.time(), 0))
+            except Exception:
+                break
+            if kind == 'SAT':
+                answer = (TRUE, data, statistics)
+                break
+            elif kind == 'UNSAT' and data:
+                pending = 0
+            elif kind == 'UNSAT':
+                pending -= 1
+            else:
+                num_splits += 1
+                num_cubes += len(data)
+                pending += len(data) - 1
+                for cube in data:
+                    tasks.put(cube)
+        if pending == 0:
+            answer = (FALSE, None, None)
+    finally:
+        for worker in workers:
+            worker.terminate()
+        for worker in workers:
+            worker.join()
+    outcome, model, statistics = answer
+    return outcome, model, str(num_cubes)+'\n'+str(num_splits)+('' if statistics == None else '\n'+statistics)
+
+
+def printModel(model, width=78, output=sys.stdout):
+    """
+    prints a list of dimacs literals in the format of the SAT competitions: lines starting with 'v', ended by 0
+    """
+    line = 'v'
+    for l in model+[0]:
+        token = ' '+str(l)
+        if len(line)+len(token) > width:
+            output.write(line+'\n')
+            line = 'v'
+        line += token
+    output.write(line+'\n')
+
 
 def cmdLineSolver():
     """
     simple usage of the module: read a dimacs file and solve it
     """  
-    solver = Solver()
     signal.signal(signal.SIGINT, signal_handler)
     
     parser = argparse.ArgumentParser(description='Minimalistic CDCL SAT solver')
     
     parser.add_argument('file',type=str,help='path to instance file')
-    parser.add_argument('--forget',type=float,default=0.6,help='Forgetfulness (0: keep every clause, 1: forget everything)')
+    parser.add_argument('--cache',type=str,nargs='?',const='',default=None,help='Load the instance from (or save it to) a binary cache in the given directory (next to the instance by default)')
+    parser.add_argument('--model',action='store_true',help='Print the model (v lines) if the instance is satisfiable')
+    parser.add_argument('--preprocess',action='store_true',help='Simplify the instance before search (unit propagation, subsumption, self-subsuming resolution and variable elimination)')
+    parser.add_argument('--forget',type=float,default=0.5,help='Forgetfulness, fraction of the unused local learnt clauses forgotten at each reduction (0: keep every clause, 1: forget everything)')
     parser.add_argument('--random',type=float,default=0.05,help='Randomness (probability of second-best decision)')
     parser.add_argument('--seed',type=int,default=12345,help='Random seed')
+    parser.add_argument('--branching',type=str,default='vsids',choices=['vsids','vmtf'],help='Branching heuristic')
+    parser.add_argument('--phase',type=str,default='saved',choices=['saved','true','false','target','best'],help='Polarity of the decisions')
+    parser.add_argument('--rephase',type=int,default=0,help='Number of conflicts between two rephasings (0: never)')
+    parser.add_argument('--restart',type=str,default='luby',choices=['geometric','luby','glucose'],help='Restart strategy')
+    parser.add_argument('--reuse-trail',action='store_true',help='Partial restarts, keeping the decisions that would be taken again')
+    parser.add_argument('--minimize',type=str,default='recursive',choices=['none','local','recursive'],help='Minimization of learnt clauses')
+    parser.add_argument('--progress',type=str,default=None,help='Write the progress of the search (JSON lines) in the given file or file descriptor (- for the standard output)')
+    parser.add_argument('--progress-seconds',type=float,default=1.0,help='Seconds between two progress lines')
+    parser.add_argument('--progress-conflicts',type=int,default=0,help='Conflicts between two progress lines (overrides --progress-seconds if positive)')
+    parser.add_argument('--proof',type=str,default=None,help='Write a DRAT proof in the given file (- for the standard output) if the instance is unsatisfiable')
+    parser.add_argument('--proof-format',type=str,default='binary',choices=['binary','text'],help='Format of the DRAT proof')
+    parser.add_argument('--share',action='store_true',help='With --portfolio, the solvers exchange their short learned clauses through shared memory')
+    parser.add_argument('--cube-depth',type=int,default=0,help='With --cubes, number of decisions of the initial cubes (0: log2 of the number of processes, plus 2)')
+    parser.add_argument('--cube-time',type=float,default=10.0,help='With --cubes, seconds after which a cube is split again')
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument('--instrumented',action='store_true',help='Use the instrumented solver (traces and checks set by VERBOSE and CHECKED)')
+    mode.add_argument('--profile',type=str,default=None,help='Profile the search, and write the profile (JSON) in the given file (- for the standard output)')
+    mode.add_argument('--portfolio',type=int,nargs='?',const=0,default=None,help='Run the given number of solvers (one per core by default) with different settings in parallel processes, the first answer is kept (the first solver follows the other options)')
+    mode.add_argument('--cubes',type=int,nargs='?',const=0,default=None,help='Cube and conquer: split the instance by lookahead and solve the cubes with the given number of processes (one per core by default)')
     
     args = parser.parse_args()
+    if (args.portfolio != None or args.cubes != None) and (args.proof != None or args.progress != None):
+        parser.error('--portfolio and --cubes are incompatible with --proof and --progress')
+    if args.proof == '-' and args.progress == '-':
+        parser.error('--proof and --progress cannot both use the standard output')
+    if args.share and args.portfolio == None:
+        parser.error('--share requires --portfolio')
     
-    solver.readDimacs(args.file)
-    solver._forgetfulness = args.forget
-    solver.setRandom(args.random, args.seed)
+    solver = InstrumentedSolver() if args.instrumented else ProfiledSolver() if args.profile != None else Solver()
+    if args.proof != None:
+        # the proof is started before loading, for the simplifications of the clauses at level 0
+        solver._proof = DratWriter(args.proof, solver.getNumAtoms(), args.proof_format == 'binary')
+    solver.readDimacs(args.file, args.cache)
+    config = {'forget':args.forget, 'random':args.random, 'seed':args.seed, 'branching':args.branching, 'phase':args.phase, 'rephase':args.rephase, 'restart':args.restart, 'reuse_trail':args.reuse_trail, 'minimize':args.minimize, 'preprocess':args.preprocess}
+    
+    if args.portfolio != None:
+        configurations = portfolioConfigurations(args.portfolio or multiprocessing.cpu_count(), config)
+        outcome, model, index, statistics, errors = solvePortfolio(solver, configurations, exchange=ClauseExchange() if args.share else None)
+        print 'Satisfiable' if outcome == TRUE else 'Unsatisfiable' if outcome == FALSE else 'Unknown'
+        if index != None:
+            print 'answer of worker %i'%index
+            print statistics
+        else:
+            if len(errors) == len(configurations):
+                sys.stderr.write('no worker answered\n')
+            for index, error in errors:
+                sys.stderr.write('worker %i failed:\n%s'%(index, error))
+        if args.model and outcome == TRUE:
+            printModel(model)
+        return
+    
+    configure(solver, **config)
+    if args.cubes != None:
+        outcome, model, statistics = solveCubes(solver, args.cubes or multiprocessing.cpu_count(), args.cube_depth, args.cube_time)
+        print 'Satisfiable' if outcome == TRUE else 'Unsatisfiable' if outcome == FALSE else 'Unknown'
+        print statistics
+        if args.model and outcome == TRUE:
+            printModel(model)
+        return
+
+    if args.progress != None:
+        solver._progress = ProgressReporter(solver, args.progress, args.progress_seconds, args.progress_conflicts)
     
     outcome = solver.restartSearch()
+    if args.proof != None:
+        solver._proof.close()
     
-    print 'Satisfiable' if outcome == TRUE else 'Unsatisfiable' if outcome == FALSE else 'Unknown'
-    print solver.getStatistics()   
+    # the standard output is kept for the proof if it is written there
+    output = sys.stderr if args.proof == '-' else sys.stdout
+    print >>output, 'Satisfiable' if outcome == TRUE else 'Unsatisfiable' if outcome == FALSE else 'Unknown'
+    print >>output, solver.getStatistics()
+    if args.model and outcome == TRUE:
+        printModel(solver.model(), output=output)
+    
+    if args.profile != None:
+        profile = json.dumps(solver.getProfile(), sort_keys=True)
+        if args.profile == '-':
+            print >>output, profile
+        else:
+            with open(args.profile, 'w') as output:
+                output.write(profile+'\n')
     
 if __name__ == '__main__':
     cmdLineSolver()   
@@ -0,0 +1,252 @@
+##@mainpage Satire
+# @authors Emmanuel Hebrard
+#
+# \section intro_sec What is Satire?
+# Satire is a pure python SAT Conflict Driven Clause Learning solver.
+#
+# \section license_sec License:
+#  Satire is a Conflict Driven Clause Learning solver
+#  Copyright (C) 2014 CNRS
+#
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published by
+#  the Free Software Foundation; either version 2 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with this program; if not, write to the Free Software
+#  Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+#
+#  The author may not be bothered electronically or otherwise
+
+from array import array
+
+from structures import ActivityHeap
+
+
+###################################################
+########  GENERIC CLASS FOR BRANCHING RULES  ######
+###################################################
+class BranchingHeuristic:
+    """
+    Interface of the branching heuristics, called by the solver:
+    - decide() when branching
+    - bump(a) for every atom involved in a conflict analysis
+    - decay() once per conflict
+    - reinsert(atoms) with the atoms freed by a backtrack
+    - rescale() when the scores grow too large
+    - score(a) to compare atoms (the higher, the earlier it is chosen), for partial restarts
+    - resize(n) when atoms are added (between two incremental calls)
+    activity is the initial score of every atom (the higher, the earlier it is chosen)
+    """
+    def __init__(self, solver, activity):
+        self._solver = solver
+
+    def decide(self):
+        """
+        returns an atom that is not yet in the belief base of the solver
+        """
+        pass
+
+    def alternative(self, a):
+        """
+        returns an atom, other than a, that is not yet in the belief base (the second best choice), or a if there is none
+        """
+        return a
+
+    def bump(self, a):
+        pass
+
+    def decay(self):
+        pass
+
+    def rescale(self):
+        pass
+
+    def reinsert(self, atoms):
+        pass
+
+    def score(self, a):
+        return 0
+
+    def resize(self, n):
+        pass
+
+
+class EVSIDS(BranchingHeuristic):
+    """
+    Exponential VSIDS: the activity of every atom involved in a conflict is increased by an increment, which grows geometrically (by 1/decay) after every conflict
+    all activities and the increment are divided by bound when an activity (or the increment) exceeds bound
+    atoms are kept in an ActivityHeap, atoms in the belief base are lazily removed when deciding
+    """
+    def __init__(self, solver, activity, decay=.95, bound=1e100):
+        BranchingHeuristic.__init__(self, solver, activity)
+        self._heap      = ActivityHeap(activity)
+        self._increment = 1.0
+        self._decay     = decay
+        self._bound     = bound
+
+    def decide(self):
+        a = self._heap.heappop()
+        while self._solver.known(a):
+            a = self._heap.heappop()
+        return a
+
+    def alternative(self, a):
+        if len(self._heap) == 0:
+            return a
+        b = self._heap.heappop()
+        while self._solver.known(b):
+            if len(self._heap) == 0:
+                return a
+            b = self._heap.heappop()
+        self._heap.push(a)
+        return b
+
+    def bump(self, a):
+        activity = self._heap[a] + self._increment
+        self._heap[a] = activity
+        if activity > self._bound:
+            self.rescale()
+
+    def decay(self):
+        self._increment /= self._decay
+        if self._increment > self._bound:
+            self.rescale()
+
+    def rescale(self):
+        self._heap.scalePriority(self._bound, 1.0)
+        self._increment /= self._bound
+
+    def reinsert(self, atoms):
+        self._heap.pushAll(atoms)
+
+    def score(self, a):
+        return self._heap[a]
+
+    def resize(self, n):
+        self._heap.resize(n)
+
+
+class VMTF(BranchingHeuristic):
+    """
+    Variable Move To Front: atoms are kept in a doubly linked list, the atoms involved in a conflict are moved to the end of the list (in O(1))
+    - self._stamp[a] gives the time of the last move of atom a, the list is ordered by increasing stamps
+    - every atom after self._search in the list is in the belief base: decisions start from there and go backward
+    the atoms bumped during a conflict analysis are moved when decay() is called, in the order of their previous stamps
+    """
+    def __init__(self, solver, activity):
+        BranchingHeuristic.__init__(self, solver, activity)
+        n = len(activity)
+        self._prev    = array('i', [-1]*n)
+        self._next    = array('i', [-1]*n)
+        self._stamp   = array('l', [0]*n)
+        self._first   = -1
+        self._last    = -1
+        self._time    = 0
+        self._bumped  = []
+        # initially, the most active atoms are at the end of the list
+        for a in sorted(range(n), key=lambda a: activity[a]):
+            self._enqueue(a)
+        self._search  = self._last
+
+    def _enqueue(self, a):
+        """
+        put atom a at the end of the list
+        """
+        self._time += 1
+        self._stamp[a] = self._time
+        self._prev[a] = self._last
+        self._next[a] = -1
+        if self._last >= 0:
+            self._next[self._last] = a
+        else:
+            self._first = a
+        self._last = a
+
+    def _dequeue(self, a):
+        """
+        remove atom a from the list
+        """
+        if self._prev[a] >= 0:
+            self._next[self._prev[a]] = self._next[a]
+        else:
+            self._first = self._next[a]
+        if self._next[a] >= 0:
+            self._prev[self._next[a]] = self._prev[a]
+        else:
+            self._last = self._prev[a]
+
+    def decide(self):
+        a = self._search
+        while self._solver.known(a):
+            a = self._prev[a]
+        self._search = a
+        return a
+
+    def alternative(self, a):
+        b = self._prev[a]
+        while b >= 0 and self._solver.known(b):
+            b = self._prev[b]
+        return a if b < 0 else b
+
+    def bump(self, a):
+        self._bumped.append(a)
+
+    def decay(self):
+        if len(self._bumped) == 0:
+            return
+        stamp = self._stamp
+        self._bumped.sort(key=stamp.__getitem__)
+        for a in self._bumped:
+            if a != self._last:
+                self._dequeue(a)
+                self._enqueue(a)
+            else:
+                self._time += 1
+                stamp[a] = self._time
+            if not self._solver.known(a):
+                self._search = a
+        self._bumped = []
+        if self._time > 1<<62:
+            self.rescale()
+
+    def rescale(self):
+        """
+        renumber the stamps from 1 in list order
+        """
+        self._time = 0
+        a = self._first
+        while a >= 0:
+            self._time += 1
+            self._stamp[a] = self._time
+            a = self._next[a]
+
+    def reinsert(self, atoms):
+        stamp = self._stamp
+        search = stamp[self._search]
+        for a in atoms:
+            if stamp[a] > search:
+                search = stamp[a]
+                self._search = a
+
+    def score(self, a):
+        return self._stamp[a]
+
+    def resize(self, n):
+        """
+        the new atoms are put at the end of the list (they are chosen first)
+        """
+        first = len(self._stamp)
+        if n > first:
+            self._prev.extend([-1]*(n-first))
+            self._next.extend([-1]*(n-first))
+            self._stamp.extend([0]*(n-first))
+            for a in range(first, n):
+                self._enqueue(a)
+            self._search = self._last
+###################################################
@@ -45,9 +45,37 @@ CHK_SOLUTION = 1
 CHK_PROPAG   = 4
 CHK_WATCHED  = 8
 
+SEEN      = 1
+REDUNDANT = 2
+REQUIRED  = 3
+
+MIN_NONE      = 0
+MIN_LOCAL     = 1
+MIN_RECURSIVE = 2
+
+PHASE_SAVED  = 0
+PHASE_TRUE   = 1
+PHASE_FALSE  = 2
+PHASE_TARGET = 3
+PHASE_BEST   = 4
+
+REPHASE_ORIGINAL = 0
+REPHASE_INVERTED = 1
+REPHASE_BEST     = 2
+REPHASE_RANDOM   = 3
+
+PROFILED_PHASES = ('propagation', 'analysis', 'decision', 'reduction', 'restarts')
+
 ACTIVE        = 1
 INACTIVE      = 0
-TO_DEACTIVATE = -1
+TO_DEACTIVATE = 2
+
+STATUS       = 3
+LEARNT       = 4
+USED         = 8
+IMPORTED     = 16
+HEADER_FLAGS = 31
+LBD_SHIFT    = 5
 
 
 VERBOSE = 0 #DBG_LEARNING #DBG_ACTIVITY #DBG_PROPAG|DBG_LEARNING
@@ -0,0 +1,229 @@
+##@mainpage Satire
+# @authors Emmanuel Hebrard
+#
+# \section intro_sec What is Satire?
+# Satire is a pure python SAT Conflict Driven Clause Learning solver.
+#
+# \section license_sec License:
+#  Satire is a Conflict Driven Clause Learning solver
+#  Copyright (C) 2014 CNRS
+#
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published by
+#  the Free Software Foundation; either version 2 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with this program; if not, write to the Free Software
+#  Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+#
+#  The author may not be bothered electronically or otherwise
+
+
+import os
+import re
+import gc
+import sys
+import gzip
+import bz2
+import struct
+import hashlib
+from array import array
+
+try:
+    import lzma
+except ImportError:
+    try:
+        from backports import lzma
+    except ImportError:
+        lzma = None
+
+
+CHUNK_SIZE = 1<<22
+
+# comments, header and end of data
+SPECIAL_LINE = re.compile('^[cp%].*\n?', re.M)
+
+
+def openCompressed(filename):
+    """
+    opens filename for reading, decompressing on the fly the files ending with .gz, .bz2 or .xz (.xz requires the lzma module, or backports.lzma in Python 2)
+    """
+    if filename.endswith('.gz'):
+        return gzip.open(filename, 'rb')
+    elif filename.endswith('.bz2'):
+        return bz2.BZ2File(filename, 'rb')
+    elif filename.endswith('.xz') or filename.endswith('.lzma'):
+        if lzma == None:
+            raise IOError('reading '+filename+' requires the lzma module (pip install backports.lzma)')
+        return lzma.LZMAFile(filename, 'rb')
+    return open(filename, 'rb')
+
+
+##############################################
+########  DIMACS CNF READER  ################
+##############################################
+class DimacsReader:
+    """
+    Reads a (possibly compressed) dimacs cnf file by chunks of chunk_size bytes, clauses() yields the clauses as lists of literals
+    - a clause ends with 0 and may span several lines or share a line with other clauses
+    - the comment lines are appended to self.comments, self.num_atoms and self.num_clauses are set when the 'p cnf' line is read (hence before the first clause is yielded)
+    - the data ends at the end of the file or at a line starting with '%' (as in the SATLIB benchmarks)
+    the tokens of the lines between two comments (or the header) are tokenized in bulk
+    """
+    def __init__(self, filename, chunk_size=CHUNK_SIZE):
+        self.comments    = []
+        self.num_atoms   = 0
+        self.num_clauses = 0
+        self._filename   = filename
+        self._chunk_size = chunk_size
+
+    def _chunks(self):
+        """
+        yields the content of the file by pieces made of whole lines
+        """
+        cnffile = openCompressed(self._filename)
+        try:
+            rest = ''
+            while True:
+                data = cnffile.read(self._chunk_size)
+                if not data:
+                    break
+                end = data.rfind('\n')
+                if end < 0:
+                    rest += data
+                else:
+                    yield rest + data[:end+1]
+                    rest = data[end+1:]
+            if rest:
+                yield rest
+        finally:
+            cnffile.close()
+
+    def _tokens(self):
+        """
+        yields the lists of tokens (strings) of the clauses, chunk by chunk
+        """
+        for chunk in self._chunks():
+            if 'c' not in chunk and 'p' not in chunk and '%' not in chunk:
+                yield chunk.split()
+                continue
+            tokens = []
+            start = 0
+            for line in SPECIAL_LINE.finditer(chunk):
+                tokens.extend(chunk[start:line.start()].split())
+                start = line.end()
+                line = line.group(0)
+                if line.startswith('c'):
+                    self.comments.append(line)
+                elif line.startswith('p'):
+                    data = line.split()
+                    self.num_atoms = int(data[2])
+                    self.num_clauses = int(data[3])
+                else:
+                    yield tokens
+                    return
+            tokens.extend(chunk[start:].split())
+            yield tokens
+
+    def clauses(self):
+        """
+        yields the clauses as lists of literals (in the encoding of definitions.lit)
+        the tokens of a chunk are converted in one pass, the 0s becoming -2, and the clauses are sliced between two -2
+        """
+        # only acyclic objects are allocated, the cyclic garbage collector is paused
+        collect = gc.isenabled()
+        gc.disable()
+        try:
+            for clause in self._clauses_():
+                yield clause
+        finally:
+            if collect:
+                gc.enable()
+
+    def _clauses_(self):
+        rest = []
+        for tokens in self._tokens():
+            lits = [v+v-1 if v > 0 else -v-v-2 for v in map(int, tokens)]
+            start = 0
+            while True:
+                try:
+                    end = lits.index(-2, start)
+                except ValueError:
+                    break
+                if rest:
+                    # the clause started in a previous chunk
+                    yield rest + lits[start:end]
+                    rest = []
+                else:
+                    yield lits[start:end]
+                start = end+1
+            rest.extend(lits[start:])
+        if rest:
+            yield rest
+##############################################
+
+
+##############################################
+########  BINARY CACHE OF A CNF  ############
+##############################################
+# magic, byte order, size of the items of the arrays, size, mtime, device, inode and sha1 of the source file, numbers of atoms and of variables of the instance,
+# lengths of the arena, of the (concatenated) watch lists and implication lists, number of unit clauses and length of the comments
+CACHE_MAGIC  = 'SATIRE\x00\x03'
+CACHE_HEADER = struct.Struct('<8scBQdQQ40sQQQQQQQ')
+
+
+def fileDigest(filename):
+    """
+    sha1 of the content of filename
+    """
+    digest = hashlib.sha1()
+    with open(filename, 'rb') as source:
+        data = source.read(CHUNK_SIZE)
+        while data:
+            digest.update(data)
+            data = source.read(CHUNK_SIZE)
+    return digest.hexdigest()
+
+
+def cachePath(filename, cache_dir=None):
+    """
+    name of the cache file of filename, in cache_dir or next to filename if cache_dir is None or empty
+    in cache_dir, the name is made unique by the sha1 of the absolute path of filename, since files of different directories may have the same name
+    """
+    if not cache_dir:
+        return filename+'.satire'
+    path = hashlib.sha1(os.path.abspath(filename)).hexdigest()[:16]
+    return os.path.join(cache_dir, os.path.basename(filename)+'.'+path+'.satire')
+
+
+def cacheHeader(status, digest, num_atoms, num_variables, num_arena, num_watches, num_binaries, num_units, num_comments):
+    """
+    header of a cache file, for a source file of the given status (os.stat) and sha1
+    """
+    return CACHE_HEADER.pack(CACHE_MAGIC, sys.byteorder[0], array('I').itemsize, status.st_size, status.st_mtime, status.st_dev, status.st_ino, digest, num_atoms, num_variables, num_arena, num_watches, num_binaries, num_units, num_comments)
+
+
+def readCacheHeader(cachefile, filename):
+    """
+    reads the header of the open cache file cachefile and returns its fields if the cache is valid for the source file filename and None otherwise
+    the cache is valid if it was written for the same file (device and inode) and if the size and the modification time of the source did not change, or if the size did not change and the sha1 of the content is the same
+    """
+    data = cachefile.read(CACHE_HEADER.size)
+    if len(data) < CACHE_HEADER.size:
+        return None
+    header = CACHE_HEADER.unpack(data)
+    magic, byteorder, itemsize, size, mtime, device, inode, digest = header[:8]
+    if magic != CACHE_MAGIC or byteorder != sys.byteorder[0] or itemsize != array('I').itemsize:
+        return None
+    status = os.stat(filename)
+    if status.st_dev != device or status.st_ino != inode or status.st_size != size:
+        return None
+    if status.st_mtime != mtime and fileDigest(filename) != digest:
+        return None
+    return header
+##############################################
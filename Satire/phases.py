@@ -0,0 +1,147 @@
+##@mainpage Satire
+# @authors Emmanuel Hebrard
+#
+# \section intro_sec What is Satire?
+# Satire is a pure python SAT Conflict Driven Clause Learning solver.
+#
+# \section license_sec License:
+#  Satire is a Conflict Driven Clause Learning solver
+#  Copyright (C) 2014 CNRS
+#
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published by
+#  the Free Software Foundation; either version 2 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with this program; if not, write to the Free Software
+#  Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+#
+#  The author may not be bothered electronically or otherwise
+
+import random
+from array import array
+
+from definitions import *
+
+
+#############################################
+########  POLARITY OF THE DECISIONS  ########
+#############################################
+class PhaseSelector:
+    """
+    Chooses the polarity of the decisions
+    - self._saved[a] is the last value of atom a (saved when backtracking)
+    - self._target[a] is the value of atom a in the largest consistent assignment since the last rephasing
+    - self._best[a] is the value of atom a in the largest consistent assignment since the last REPHASE_BEST
+    target and best values of atoms that are not in the recorded assignment are left unchanged (UNDEF if never recorded)
+    the policy is one of:
+    - PHASE_SAVED: the saved phase
+    - PHASE_TRUE, PHASE_FALSE: always the same polarity
+    - PHASE_TARGET, PHASE_BEST: the target (resp. best) phase, or the saved phase for atoms out of the target (resp. best) assignment
+    rephase() overwrites the saved phases, following the schedule (REPHASE_ORIGINAL, REPHASE_INVERTED, REPHASE_BEST or REPHASE_RANDOM) in a round robin fashion
+    the target (resp. best) assignment is recorded only if the policy is PHASE_TARGET (resp. PHASE_BEST), or if rephasing is set and the schedule contains REPHASE_BEST (for the best assignment)
+    """
+    def __init__(self, solver, policy=PHASE_SAVED, initial=FALSE, schedule=[REPHASE_ORIGINAL, REPHASE_BEST, REPHASE_INVERTED, REPHASE_BEST, REPHASE_RANDOM, REPHASE_BEST], rephasing=False):
+        n = solver.getNumAtoms()
+        self._solver      = solver
+        self._policy      = policy
+        self._initial     = initial
+        self._schedule    = schedule
+        self._num_rephase = 0
+        self._saved       = array('b', [initial]*n)
+        self._target      = array('b', [UNDEF]*n)
+        self._best        = array('b', [UNDEF]*n)
+        self._target_size = 0
+        self._best_size   = 0
+        self._use_target  = policy == PHASE_TARGET
+        self._use_best    = policy == PHASE_BEST or (rephasing and REPHASE_BEST in schedule)
+
+    def resize(self, n):
+        extension = n-len(self._saved)
+        if extension > 0:
+            self._saved.extend([self._initial]*extension)
+            self._target.extend([UNDEF]*extension)
+            self._best.extend([UNDEF]*extension)
+
+    def polarity(self, a):
+        """
+        returns the truth value to try first for atom a
+        """
+        if self._policy == PHASE_SAVED:
+            return self._saved[a]
+        elif self._policy == PHASE_TRUE:
+            return TRUE
+        elif self._policy == PHASE_FALSE:
+            return FALSE
+        elif self._policy == PHASE_TARGET and self._target[a] != UNDEF:
+            return self._target[a]
+        elif self._policy == PHASE_BEST and self._best[a] != UNDEF:
+            return self._best[a]
+        return self._saved[a]
+
+    def save(self, freed, consistent, size):
+        """
+        called before backtracking: the atoms of the belief base in [freed:size] are about to be freed, the prefix [:consistent] of the belief base is a consistent assignment
+        """
+        solver = self._solver
+        truth = solver._truth
+        saved = self._saved
+        for a in solver._known[freed:size]:
+            saved[a] = truth[a]
+        if self._use_target and consistent > self._target_size:
+            self._target_size = self._record(self._target, consistent)
+        if self._use_best and consistent > self._best_size:
+            self._best_size = self._record(self._best, consistent)
+
+    def _record(self, phases, size):
+        """
+        copy the prefix [:size] of the belief base in phases
+        """
+        truth = self._solver._truth
+        for a in self._solver._known[:size]:
+            phases[a] = truth[a]
+        return size
+
+    def snapshot(self):
+        """
+        returns a copy of the saved, target and best phases, for restore()
+        """
+        return (array('b', self._saved), array('b', self._target), array('b', self._best), self._target_size, self._best_size)
+
+    def restore(self, state):
+        """
+        puts back the phases returned by snapshot() (the atoms added since keep their current phases)
+        """
+        saved, target, best, self._target_size, self._best_size = state
+        self._saved[:len(saved)] = saved
+        self._target[:len(target)] = target
+        self._best[:len(best)] = best
+
+    def rephase(self):
+        """
+        overwrites the saved phases with the next phases of the schedule, and resets the target phases
+        """
+        kind = self._schedule[self._num_rephase % len(self._schedule)]
+        self._num_rephase += 1
+        saved = self._saved
+        if kind == REPHASE_ORIGINAL:
+            for a in range(len(saved)):
+                saved[a] = self._initial
+        elif kind == REPHASE_INVERTED:
+            for a in range(len(saved)):
+                saved[a] = 1-self._initial
+        elif kind == REPHASE_RANDOM:
+            for a in range(len(saved)):
+                saved[a] = random.randint(FALSE, TRUE)
+        elif kind == REPHASE_BEST:
+            for a in range(len(saved)):
+                if self._best[a] != UNDEF:
+                    saved[a] = self._best[a]
+            self._best_size = 0
+        self._target_size = 0
+#############################################
@@ -0,0 +1,333 @@
+##@mainpage Satire
+# @authors Emmanuel Hebrard
+#
+# \section intro_sec What is Satire?
+# Satire is a pure python SAT Conflict Driven Clause Learning solver.
+#
+# \section license_sec License:
+#  Satire is a Conflict Driven Clause Learning solver
+#  Copyright (C) 2014 CNRS
+#
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published by
+#  the Free Software Foundation; either version 2 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with this program; if not, write to the Free Software
+#  Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+#
+#  The author may not be bothered electronically or otherwise
+
+
+import time
+from array import array
+
+from definitions import *
+import statistics as stat
+
+
+#############################################
+########  SATELITE PREPROCESSING  ###########
+#############################################
+class Preprocessor:
+    """
+    SatELite-style simplification of a set of clauses, before search:
+    - level-0 unit propagation
+    - subsumption and self-subsuming resolution (strengthening), each added or strengthened clause is checked against the clauses sharing its least frequent atom
+    - bounded variable elimination: an atom is replaced by the resolvents of its clauses if there are no more (non-tautological) resolvents than clauses, and none is longer than max_resolvent (the atoms with a literal in more than max_occurrences clauses are not tried)
+    self._clauses[i] is the list of literals of clause i (None once removed), self._occurs[p] the set of the clauses containing p
+    the atoms in frozen are never eliminated
+    the clauses of an eliminated atom are pushed on the reconstruction stack self._stack, with the literal of the atom first: extend() reverts the eliminations on a model of the simplified clauses
+    if proof is not None (see proof.DratWriter), the derived clauses (resolvents, strengthened and simplified clauses) are written as additions, before the deletion of the clauses they replace, and the removed clauses as deletions
+    """
+    def __init__(self, num_atoms, clauses, frozen=(), max_resolvent=20, max_occurrences=64, time_limit=60.0, proof=None):
+        self._num_atoms       = num_atoms
+        self._clauses         = []
+        self._signature       = []
+        self._occurs          = [set() for p in range(2*num_atoms)]
+        self._value           = array('b', [UNDEF]*(2*num_atoms))
+        self._eliminated      = array('b', [0]*num_atoms)
+        self._frozen          = set(frozen)
+        self._units           = []
+        self._queue           = []
+        self._touched         = set()
+        self._stack           = []
+        self._max_resolvent   = max_resolvent
+        self._max_occurrences = max_occurrences
+        self._time_limit      = time_limit
+        self._proof           = proof
+        self.inconsistent     = False
+
+        self.num_clauses      = stat.Statistic('number of removed clauses', 0)
+        self.num_fixed        = stat.Statistic('number of fixed atoms', 0)
+        self.num_subsumed     = stat.Statistic('number of subsumed clauses', 0)
+        self.num_strengthened = stat.Statistic('number of strengthened clauses', 0)
+        self.num_eliminated   = stat.Statistic('number of eliminated atoms', 0)
+        self.time             = stat.Statistic('preprocessing time', 0)
+
+        for clause in clauses:
+            self.addClause(clause)
+        self._num_original = self.numClauses()
+
+    def __str__(self):
+        return '\n'.join([str(self.num_clauses), str(self.num_fixed), str(self.num_subsumed), str(self.num_strengthened), str(self.num_eliminated), str(self.time)])
+
+    ################################
+    ########  CLAUSE SET  ##########
+    ################################
+    def numClauses(self):
+        return len(self._clauses) - self._clauses.count(None) + len(self._units)
+
+    def addClause(self, clause, derived=False):
+        """
+        adds a clause (without duplicate literals, tautologies, satisfied clauses and false literals)
+        the clause is written in the proof if it is derived, or if it was simplified
+        """
+        value = self._value
+        literals = []
+        for p in clause:
+            if value[p] == TRUE or p^1 in literals:
+                return
+            if value[p] == UNDEF and p not in literals:
+                literals.append(p)
+        if self._proof != None and (derived or len(literals) < len(clause)):
+            self._proof.add(literals)
+        if len(literals) == 0:
+            self.inconsistent = True
+        elif len(literals) == 1:
+            self.assign(literals[0])
+        else:
+            i = len(self._clauses)
+            self._clauses.append(literals)
+            self._signature.append(signature(literals))
+            for p in literals:
+                self._occurs[p].add(i)
+                self._touched.add(atom(p))
+            self._queue.append(i)
+
+    def removeClause(self, i):
+        if self._proof != None:
+            self._proof.delete(self._clauses[i])
+        self._detach_(i)
+
+    def _detach_(self, i):
+        for p in self._clauses[i]:
+            self._occurs[p].discard(i)
+            self._touched.add(atom(p))
+        self._clauses[i] = None
+
+    def strengthen(self, i, p):
+        """
+        removes the literal p from clause i
+        """
+        clause = self._clauses[i]
+        if self._proof != None:
+            self._proof.add([q for q in clause if q != p])
+            self._proof.delete(clause)
+        clause.remove(p)
+        self._occurs[p].discard(i)
+        self._touched.add(atom(p))
+        if len(clause) == 1:
+            self._detach_(i)
+            self.assign(clause[0])
+        else:
+            self._signature[i] = signature(clause)
+            self._queue.append(i)
+
+    def assign(self, p):
+        if self._value[p] == FALSE:
+            self.inconsistent = True
+        elif self._value[p] == UNDEF:
+            self._value[p] = TRUE
+            self._value[p^1] = FALSE
+            self._units.append(p)
+
+    def propagate(self):
+        """
+        level-0 unit propagation: removes the satisfied clauses and the false literals
+        """
+        fixed = self.num_fixed.getValue()
+        while fixed < len(self._units) and not self.inconsistent:
+            p = self._units[fixed]
+            fixed += 1
+            for i in list(self._occurs[p]):
+                self.removeClause(i)
+            for i in list(self._occurs[p^1]):
+                self.strengthen(i, p^1)
+        self.num_fixed.setValue(fixed)
+
+    ################################
+    ########  SUBSUMPTION  #########
+    ################################
+    def subsume(self, i):
+        """
+        removes the clauses subsumed by clause i, and strengthens the clauses that can be resolved with clause i into a subset of themselves
+        """
+        clause = self._clauses[i]
+        sig = self._signature[i]
+        occurs = self._occurs
+        best = min(clause, key=lambda p: len(occurs[p]) + len(occurs[p^1]))
+        for j in list(occurs[best]) + list(occurs[best^1]):
+            other = self._clauses[j]
+            if j == i or other == None or len(other) < len(clause) or (sig & ~self._signature[j]) != 0:
+                continue
+            p = subsumes(clause, other)
+            if p == None:
+                continue
+            if p < 0:
+                self.removeClause(j)
+                self.num_subsumed += 1
+            else:
+                self.strengthen(j, p^1)
+                self.num_strengthened += 1
+            if self._clauses[i] == None:
+                return
+
+    def subsumeAll(self, deadline):
+        """
+        subsumption of the queued clauses (added or strengthened) and unit propagation, until fixpoint
+        """
+        while (self._queue or self.num_fixed.getValue() < len(self._units)) and not self.inconsistent:
+            self.propagate()
+            while self._queue and time.time() < deadline:
+                i = self._queue.pop()
+                if self._clauses[i] != None:
+                    self.subsume(i)
+            if time.time() >= deadline:
+                self._queue = []
+        self.propagate()
+
+    ################################
+    ######## ELIMINATION  ##########
+    ################################
+    def eliminate(self, a):
+        """
+        eliminates atom a by resolution if it does not increase the number of clauses, returns True if it did
+        """
+        pos, neg = self._occurs[literal(a, TRUE)], self._occurs[literal(a, FALSE)]
+        if len(pos) + len(neg) == 0 or len(pos) > self._max_occurrences or len(neg) > self._max_occurrences:
+            return False
+        resolvents = []
+        for i in pos:
+            for j in neg:
+                resolvent = resolve(self._clauses[i], self._clauses[j], literal(a, TRUE))
+                if resolvent != None:
+                    if len(resolvents) >= len(pos) + len(neg) or len(resolvent) > self._max_resolvent:
+                        return False
+                    resolvents.append(resolvent)
+        # the resolvents are added first, so that they are implied by the clauses in the proof
+        for resolvent in resolvents:
+            self.addClause(resolvent, derived=True)
+        for i in list(pos) + list(neg):
+            clause = self._clauses[i]
+            p = literal(a, TRUE) if literal(a, TRUE) in clause else literal(a, FALSE)
+            self._stack.append([p] + [q for q in clause if q != p])
+            self.removeClause(i)
+        self._eliminated[a] = 1
+        self.num_eliminated += 1
+        return True
+
+    def eliminateAll(self, deadline):
+        """
+        tries to eliminate the touched atoms, cheapest first, until no atom is touched (or the deadline)
+        """
+        occurs = self._occurs
+        while self._touched and not self.inconsistent and time.time() < deadline:
+            candidates = [a for a in self._touched if not self._eliminated[a] and a not in self._frozen and self._value[2*a] == UNDEF]
+            candidates.sort(key=lambda a: len(occurs[2*a]) * len(occurs[2*a+1]))
+            self._touched = set()
+            for a in candidates:
+                if time.time() >= deadline or self.inconsistent:
+                    break
+                if self._value[2*a] == UNDEF and self.eliminate(a):
+                    self.subsumeAll(deadline)
+
+    def simplify(self):
+        """
+        runs unit propagation, subsumption and variable elimination, returns False if the clauses are inconsistent
+        """
+        start = time.time()
+        deadline = start + self._time_limit
+        self.subsumeAll(deadline)
+        self.eliminateAll(deadline)
+        self.num_clauses.setValue(self._num_original - self.numClauses())
+        self.time.setValue(int((time.time() - start)*1000))
+        return not self.inconsistent
+
+    ################################
+    ########    RESULTS   ##########
+    ################################
+    def clauses(self):
+        """
+        iterates over the simplified clauses, including one unit clause per fixed atom
+        """
+        for p in self._units:
+            yield [p]
+        for clause in self._clauses:
+            if clause != None:
+                yield clause
+
+    def eliminated(self, a):
+        return self._eliminated[a] == 1
+
+    def extend(self, truth):
+        """
+        turns a model (truth[a] is the value of atom a) of the simplified clauses into a model of the original clauses, by setting the eliminated atoms
+        the clauses of the reconstruction stack are visited from the last eliminated atom on, and their first literal is made true whenever they are not satisfied
+        returns the list of the atoms whose value was set
+        """
+        changed = []
+        for clause in reversed(self._stack):
+            for p in clause:
+                if truth[atom(p)] == spin(p):
+                    break
+            else:
+                truth[atom(clause[0])] = spin(clause[0])
+                changed.append(atom(clause[0]))
+        return changed
+#############################################
+
+
+def signature(clause):
+    """
+    bitset of the atoms of the clause (modulo 64), such that if clause c subsumes clause d, then signature(c) & ~signature(d) == 0
+    """
+    sig = 0
+    for p in clause:
+        sig |= 1<<((p>>1)&63)
+    return sig
+
+
+def subsumes(clause, other):
+    """
+    returns -1 if clause subsumes other, a literal p of clause if clause without p subsumes other with the opposite of p (so that other can be strengthened by removing the opposite of p), and None otherwise
+    """
+    literals = set(other)
+    result = -1
+    for p in clause:
+        if p not in literals:
+            if result < 0 and p^1 in literals:
+                result = p
+            else:
+                return None
+    return result
+
+
+def resolve(clause, other, pivot):
+    """
+    returns the resolvent of clause (which contains pivot) and other (which contains the opposite of pivot), or None if it is a tautology
+    """
+    literals = set(clause)
+    literals.discard(pivot)
+    resolvent = list(literals)
+    for p in other:
+        if p != pivot^1 and p not in literals:
+            if p^1 in literals:
+                return None
+            resolvent.append(p)
+    return resolvent
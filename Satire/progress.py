@@ -0,0 +1,100 @@
+##@mainpage Satire
+# @authors Emmanuel Hebrard
+#
+# \section intro_sec What is Satire?
+# Satire is a pure python SAT Conflict Driven Clause Learning solver.
+#
+# \section license_sec License:
+#  Satire is a Conflict Driven Clause Learning solver
+#  Copyright (C) 2014 CNRS
+#
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published by
+#  the Free Software Foundation; either version 2 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with this program; if not, write to the Free Software
+#  Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+#
+#  The author may not be bothered electronically or otherwise
+
+
+import os
+import sys
+import json
+import time
+import resource
+
+
+#############################################
+########  PROGRESS REPORTS  #################
+#############################################
+class ProgressReporter:
+    """
+    Writes the state of the search as a JSON line every seconds seconds or, if conflicts > 0, every conflicts conflicts
+    output is a file name, a file descriptor (int or string of digits), '-' for the standard output, or a file object
+    the solver calls conflict() after every conflict (and never during propagation) and report() when it stops
+    the rates (per second) are computed since the previous line
+    """
+    def __init__(self, solver, output='-', seconds=1.0, conflicts=0):
+        self._solver    = solver
+        self._seconds   = seconds
+        self._conflicts = conflicts
+        if output == '-':
+            self._output = sys.stdout
+        elif isinstance(output, int) or (isinstance(output, str) and output.isdigit()):
+            self._output = os.fdopen(int(output), 'w')
+        elif isinstance(output, str):
+            self._output = open(output, 'w')
+        else:
+            self._output = output
+        self._start       = time.time()
+        self._last_time   = self._start
+        self._last_conf   = solver._num_conflict
+        self._last_propag = solver._num_propag
+        self._next        = self._next_report_()
+
+    def _next_report_(self):
+        if self._conflicts > 0:
+            return self._solver._num_conflict + self._conflicts
+        return time.time() + self._seconds
+
+    def conflict(self):
+        if self._conflicts > 0:
+            if self._solver._num_conflict >= self._next:
+                self.report()
+        elif time.time() >= self._next:
+            self.report()
+
+    def report(self, status=None):
+        solver = self._solver
+        now = time.time()
+        elapsed = max(now - self._last_time, 1e-6)
+        line = {'time':round(now - self._start, 3),
+                'conflicts':solver._num_conflict,
+                'conflicts_per_sec':round((solver._num_conflict - self._last_conf)/elapsed, 1),
+                'propagations':solver._num_propag,
+                'propagations_per_sec':round((solver._num_propag - self._last_propag)/elapsed, 1),
+                'decisions':solver._num_choice,
+                'restarts':solver._num_restart,
+                'learnts':solver.num_learnt.getValue(),
+                'arena_bytes':len(solver._arena)*solver._arena.itemsize,
+                'wasted_bytes':solver._wasted*solver._arena.itemsize,
+                'max_rss_kb':resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+                'trail':solver._size,
+                'level':solver._level,
+                'fixed':solver._trail[0] if solver._level > 0 else solver._size}
+        if status != None:
+            line['status'] = status
+        self._output.write(json.dumps(line, sort_keys=True)+'\n')
+        self._output.flush()
+        self._last_time = now
+        self._last_conf = solver._num_conflict
+        self._last_propag = solver._num_propag
+        self._next = self._next_report_()
+#############################################
@@ -0,0 +1,98 @@
+##@mainpage Satire
+# @authors Emmanuel Hebrard
+#
+# \section intro_sec What is Satire?
+# Satire is a pure python SAT Conflict Driven Clause Learning solver.
+#
+# \section license_sec License:
+#  Satire is a Conflict Driven Clause Learning solver
+#  Copyright (C) 2014 CNRS
+#
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published by
+#  the Free Software Foundation; either version 2 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with this program; if not, write to the Free Software
+#  Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+#
+#  The author may not be bothered electronically or otherwise
+
+
+import sys
+
+
+#############################################
+########  DRAT PROOFS  ######################
+#############################################
+class DratWriter:
+    """
+    Writes a DRAT proof (the clauses added and deleted by the solver, in order) for an unsatisfiable instance
+    output is a file name, '-' for the standard output, or a file object (opened in binary mode if binary is True)
+    - in the binary format, a clause is the byte 'a' (addition) or 'd' (deletion), then every literal l as the variable-length encoding of 2*v (l=v) or 2*v+1 (l=-v), by groups of 7 bits (least significant first, the high bit of a byte is set when another byte follows), then a null byte
+    - in the text format, a clause is a line of dimacs literals ended by 0, prefixed by 'd ' for a deletion
+    the encoding of every literal is computed once, in self._token (indexed by internal literals), and the proof is written by chunks of buffer_size bytes
+    """
+    def __init__(self, output, num_atoms, binary=True, buffer_size=1<<20):
+        if output == '-':
+            self._output = sys.stdout
+            self._close  = False
+        elif isinstance(output, str):
+            self._output = open(output, 'wb' if binary else 'w')
+            self._close  = True
+        else:
+            self._output = output
+            self._close  = False
+        self._binary      = binary
+        self._buffer      = bytearray()
+        self._buffer_size = buffer_size
+        self._token       = []
+        if binary:
+            self._add, self._delete, self._end = 'a', 'd', '\0'
+        else:
+            self._add, self._delete, self._end = '', 'd ', '0\n'
+        self.resize(num_atoms)
+
+    def resize(self, n):
+        for p in range(len(self._token), 2*n):
+            if self._binary:
+                self._token.append(encode((p^1)+2))
+            else:
+                self._token.append(('-' if (p&1)==0 else '')+str(p/2+1)+' ')
+
+    def add(self, clause):
+        self._buffer += self._add + ''.join(map(self._token.__getitem__, clause)) + self._end
+        if len(self._buffer) >= self._buffer_size:
+            self.flush()
+
+    def delete(self, clause):
+        self._buffer += self._delete + ''.join(map(self._token.__getitem__, clause)) + self._end
+        if len(self._buffer) >= self._buffer_size:
+            self.flush()
+
+    def flush(self):
+        self._output.write(self._buffer)
+        self._output.flush()
+        self._buffer = bytearray()
+
+    def close(self):
+        self.flush()
+        if self._close:
+            self._output.close()
+#############################################
+
+
+def encode(n):
+    """
+    variable-length encoding of the positive integer n, as in binary DRAT proofs
+    """
+    code = ''
+    while n > 127:
+        code += chr(128|(n&127))
+        n >>= 7
+    return code + chr(n)
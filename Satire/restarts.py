@@ -0,0 +1,154 @@
+##@mainpage Satire
+# @authors Emmanuel Hebrard
+#
+# \section intro_sec What is Satire?
+# Satire is a pure python SAT Conflict Driven Clause Learning solver.
+#
+# \section license_sec License:
+#  Satire is a Conflict Driven Clause Learning solver
+#  Copyright (C) 2014 CNRS
+#
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published by
+#  the Free Software Foundation; either version 2 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with this program; if not, write to the Free Software
+#  Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+#
+#  The author may not be bothered electronically or otherwise
+
+
+
+#############################################
+########  RESTART STRATEGIES  ###############
+#############################################
+class RestartPolicy:
+    """
+    Interface of the restart strategies, called by the solver:
+    - conflict(lbd, size) after every conflict, with the LBD of the learned clause and the size of the belief base at the conflict, returns True if the search should restart
+    - restart() when the search restarts
+    """
+    def __init__(self, solver):
+        self._solver = solver
+
+    def conflict(self, lbd, size):
+        return False
+
+    def restart(self):
+        pass
+
+
+class Geometric(RestartPolicy):
+    """
+    restarts after base conflicts, the limit is multiplied by factor at every restart
+    """
+    def __init__(self, solver, base=100, factor=1.2):
+        RestartPolicy.__init__(self, solver)
+        self._limit   = base
+        self._factor  = factor
+        self._counter = 0
+
+    def conflict(self, lbd, size):
+        self._counter += 1
+        return self._counter >= self._limit
+
+    def restart(self):
+        self._counter = 0
+        self._limit = int(self._limit * self._factor)
+
+    def __str__(self):
+        return 'geometric limit = %i'%self._limit
+
+
+def luby(i):
+    """
+    i-th term of the Luby sequence 1 1 2 1 1 2 4 1 1 2 1 1 2 4 8... (starting from i=1)
+    """
+    k = 1
+    while (1<<k)-1 < i:
+        k += 1
+    while (1<<k)-1 != i:
+        i -= (1<<(k-1))-1
+        k = 1
+        while (1<<k)-1 < i:
+            k += 1
+    return 1<<(k-1)
+
+
+class Luby(RestartPolicy):
+    """
+    restarts after unit*luby(i) conflicts for the i-th run
+    """
+    def __init__(self, solver, unit=100):
+        RestartPolicy.__init__(self, solver)
+        self._unit    = unit
+        self._run     = 1
+        self._limit   = unit
+        self._counter = 0
+
+    def conflict(self, lbd, size):
+        self._counter += 1
+        return self._counter >= self._limit
+
+    def restart(self):
+        self._counter = 0
+        self._run += 1
+        self._limit = self._unit * luby(self._run)
+
+    def __str__(self):
+        return 'luby limit = %i'%self._limit
+
+
+class MovingAverage:
+    """
+    exponential moving average with smoothing factor alpha, the factor is 1/n for the n-th value as long as 1/n > alpha (so that the first values are not biased toward 0)
+    """
+    def __init__(self, alpha):
+        self._alpha = alpha
+        self._count = 0
+        self.value  = 0.0
+
+    def add(self, x):
+        self._count += 1
+        self.value += (x - self.value) * max(self._alpha, 1.0/self._count)
+
+
+class Glucose(RestartPolicy):
+    """
+    dynamic restarts: restarts when the recent learned clauses are worse than average, i.e., when the fast moving average of their LBD exceeds margin times the slow moving average, and at least minimum conflicts have been learned since the last restart
+    restarts are blocked (postponed) when the belief base is much larger (blocking times the moving average of its size) than usual at a conflict, that is when the solver might be close to a solution, but only after warmup conflicts
+    """
+    def __init__(self, solver, fast=1.0/32, slow=1.0/4096, margin=1.25, minimum=50, trail=1.0/5000, blocking=1.4, warmup=10000):
+        RestartPolicy.__init__(self, solver)
+        self._fast      = MovingAverage(fast)
+        self._slow      = MovingAverage(slow)
+        self._trail     = MovingAverage(trail)
+        self._margin    = margin
+        self._minimum   = minimum
+        self._blocking  = blocking
+        self._warmup    = warmup
+        self._conflicts = 0
+        self._counter   = 0
+
+    def conflict(self, lbd, size):
+        self._conflicts += 1
+        self._counter += 1
+        self._fast.add(lbd)
+        self._slow.add(lbd)
+        if self._conflicts > self._warmup and size > self._blocking * self._trail.value:
+            self._counter = 0
+        self._trail.add(size)
+        return self._counter >= self._minimum and self._fast.value > self._margin * self._slow.value
+
+    def restart(self):
+        self._counter = 0
+
+    def __str__(self):
+        return 'glucose lbd = %.2f/%.2f'%(self._fast.value, self._slow.value)
+#############################################
@@ -0,0 +1,111 @@
+##@mainpage Satire
+# @authors Emmanuel Hebrard
+#
+# \section intro_sec What is Satire?
+# Satire is a pure python SAT Conflict Driven Clause Learning solver.
+#
+# \section license_sec License:
+#  Satire is a Conflict Driven Clause Learning solver
+#  Copyright (C) 2014 CNRS
+#
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published by
+#  the Free Software Foundation; either version 2 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with this program; if not, write to the Free Software
+#  Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+#
+#  The author may not be bothered electronically or otherwise
+
+
+import multiprocessing
+
+
+#############################################
+########  CLAUSE EXCHANGE  ##################
+#############################################
+class ClauseExchange:
+    """
+    Ring buffer of learned clauses in shared memory, for solvers running in processes forked after its creation (see solvePortfolio)
+    - the buffer has slots slots of max_size+3 integers: the index of the exporting worker, the LBD and the size of the clause, then its literals
+    - self._head (shared) is the number of clauses ever exported, the clause number i is in the slot i % slots
+    - self._tail (local to each process) is the number of clauses already read by the process, a worker that is more than slots clauses late misses the oldest ones
+    a single lock protects the buffer, it is taken once per exported clause, and once per call to receive() to copy the new slots
+    the clauses exported or received by a worker are remembered (in self._seen, local), so that duplicates are neither exported nor received
+    """
+    def __init__(self, slots=4096, max_size=8, max_lbd=4, max_seen=1<<16):
+        self._slots     = slots
+        self._slot_size = max_size+3
+        self._max_size  = max_size
+        self._max_lbd   = max_lbd
+        self._max_seen  = max_seen
+        self._lock      = multiprocessing.Lock()
+        self._head      = multiprocessing.RawValue('l', 0)
+        self._ring      = multiprocessing.RawArray('i', slots*self._slot_size)
+        self._worker    = -1
+        self._tail      = 0
+        self._seen      = set()
+
+    def attach(self, worker):
+        """
+        called by a worker (in its own process) before its search, worker is its index, the clauses already in the buffer are skipped
+        """
+        self._worker = worker
+        self._tail = self._head.value
+        self._seen = set()
+
+    def _remember_(self, clause):
+        """
+        returns True if the clause was already exported or received by this process, and remembers it otherwise
+        """
+        key = tuple(sorted(clause))
+        if key in self._seen:
+            return True
+        if len(self._seen) >= self._max_seen:
+            self._seen = set()
+        self._seen.add(key)
+        return False
+
+    def export(self, clause, lbd):
+        """
+        publishes the clause if it is short enough (at most max_size literals) and either binary (or unit) or of LBD at most max_lbd, and if it is not a duplicate
+        returns True if the clause was published
+        """
+        size = len(clause)
+        if size > self._max_size or (size > 2 and lbd > self._max_lbd) or self._remember_(clause):
+            return False
+        with self._lock:
+            start = (self._head.value % self._slots) * self._slot_size
+            self._ring[start:start+3+size] = [self._worker, lbd, size] + list(clause)
+            self._head.value += 1
+        return True
+
+    def receive(self):
+        """
+        returns the clauses exported by the other workers since the last call, as a list of pairs (literals, LBD)
+        """
+        with self._lock:
+            head = self._head.value
+            tail = max(self._tail, head-self._slots)
+            first, last = tail % self._slots, head % self._slots
+            if head == tail:
+                return []
+            elif first < last:
+                data = self._ring[first*self._slot_size:last*self._slot_size]
+            else:
+                data = self._ring[first*self._slot_size:] + self._ring[:last*self._slot_size]
+        self._tail = head
+        clauses = []
+        for start in range(0, len(data), self._slot_size):
+            if data[start] != self._worker:
+                clause = data[start+3:start+3+data[start+2]]
+                if not self._remember_(clause):
+                    clauses.append((clause, data[start+1]))
+        return clauses
+#############################################
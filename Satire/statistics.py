@@ -68,13 +68,25 @@ class Statistic:
         """docstring for __str__"""
         return self.getName()+' = '+str(self.getValue())
             
+class StatCounter(Statistic):
+    """
+    reads the integer attribute attr of solver, which the solver increments directly
+    """
+    def __init__(self, name_, solver, attr):
+        Statistic.__init__(self,name_,0)
+        self._solver = solver
+        self._attr = attr
+        
+    def update(self):
+        self._value = getattr(self._solver, self._attr)
+        
 class StatNumLearnt(Statistic):
     def __init__(self, solver):
         Statistic.__init__(self,'number of learnt clauses',0)
         self._solver = solver
         
     def update(self):
-        self._value = len(self._solver._learnts)
+        self._value = len(self._solver._core) + len(self._solver._tier2) + len(self._solver._learnts) + self._solver._num_learnt_binaries
         
 class StatSizeLearnt(Statistic):
     def __init__(self, solver):
@@ -152,6 +152,14 @@ class ActivityHeap(array):
         newme.heapify()
         return newme
                 
+    def resize(self, n):
+        """Add the items len(self._prio) to n-1 to the heap, with priority 0."""
+        first = len(self._prio)
+        if n > first:
+            self._index.extend([-1]*(n-first))
+            self._prio.extend([0.0]*(n-first))
+            self.pushAll(range(first, n))
+
     def push(self, entry):
         """Push item onto heap, maintaining the heap invariant."""
         if self._index[entry]<0:
@@ -159,6 +167,21 @@ class ActivityHeap(array):
             self.append(entry) 
             self._siftdown(0, len(self)-1)
         # self.checkIntegrity()
+        
+    def pushAll(self, entries):
+        """Push several items onto heap, the heap is rebuilt in one pass when this is cheaper than pushing them one by one."""
+        n = len(self)
+        for entry in entries:
+            if self._index[entry]<0:
+                self._index[entry] = len(self)
+                self.append(entry)
+        pushed = len(self) - n
+        if pushed * n.bit_length() > len(self):
+            self.heapify()
+        else:
+            for pos in xrange(n, len(self)):
+                self._siftdown(0, pos)
+        # self.checkIntegrity()
 
     def __setitem__(self, item, prio):
         # print 'before update'
@@ -284,7 +307,7 @@ class ActivityHeap(array):
 
     def scalePriority(self, div, mul):
         """docstring for scalePriority"""
-        for i in range(len(self)):
+        for i in range(len(self._prio)):
             self._prio[i] = self._prio[i] * mul / div
             
             
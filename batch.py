@@ -0,0 +1,131 @@
+#! /usr/bin/env python
+
+import os
+import sys
+import csv
+import glob
+import json
+import time
+import signal
+import argparse
+import multiprocessing
+
+from Satire import *
+
+
+FIELDS = ['instance', 'result', 'time', 'load_time', 'conflicts', 'decisions', 'propagations', 'restarts', 'learnts', 'error']
+
+EXTENSIONS = ('.cnf', '.cnf.gz', '.cnf.bz2', '.cnf.xz', '.cnf.lzma')
+
+
+class TimeLimit(Exception):
+    pass
+
+
+def _time_limit_(signum, frame):
+    raise TimeLimit()
+
+
+def instances(patterns, manifest=None):
+    """
+    returns the instance files given by patterns (files, glob patterns or directories, whose instances are the files with a dimacs extension) and by the manifest (one pattern per line, relative to the directory of the manifest, '#' starts a comment), without duplicates
+    """
+    if manifest != None:
+        directory = os.path.dirname(manifest)
+        with open(manifest) as lines:
+            for line in lines:
+                line = line.split('#')[0].strip()
+                if line:
+                    patterns = patterns + [os.path.join(directory, line)]
+    files = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            matches = sorted(os.path.join(pattern, name) for name in os.listdir(pattern) if name.endswith(EXTENSIONS))
+        else:
+            matches = sorted(glob.glob(pattern)) or [pattern]
+        for cnffile in matches:
+            if cnffile not in files:
+                files.append(cnffile)
+    return files
+
+
+def solveInstance(task):
+    """
+    solves one instance (in a worker process), task is (cnffile, time limit in seconds, conflict limit, seed, cache, preprocess)
+    the time limit (if positive) covers loading and search, it is enforced by SIGALRM, the conflict limit (if not negative) by the solver
+    returns a dictionary with the FIELDS
+    """
+    cnffile, time_limit, conflict_limit, seed, cache, preprocess = task
+    result = dict((field, None) for field in FIELDS)
+    result['instance'] = cnffile
+    solver = Solver()
+    solver.setRandom(seed=seed)
+    solver._preprocessing = preprocess
+    start = time.time()
+
+    signal.signal(signal.SIGALRM, _time_limit_)
+    if time_limit > 0:
+        signal.setitimer(signal.ITIMER_REAL, time_limit)
+    try:
+        solver.readDimacs(cnffile, cache)
+        result['load_time'] = round(time.time()-start, 3)
+        outcome = solver.restartSearch(limit=conflict_limit)
+        result['result'] = 'SAT' if outcome == TRUE else 'UNSAT' if outcome == FALSE else 'UNKNOWN'
+    except TimeLimit:
+        result['result'] = 'TIMEOUT'
+    except Exception as e:
+        result['result'] = 'ERROR'
+        result['error'] = repr(e)
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+
+    result['time'] = round(time.time()-start, 3)
+    result['conflicts'] = solver._num_conflict
+    result['decisions'] = solver._num_choice
+    result['propagations'] = solver._num_propag
+    result['restarts'] = solver._num_restart
+    result['learnts'] = solver.num_learnt.getValue()
+    return result
+
+
+if __name__ == '__main__':
+
+    parser = argparse.ArgumentParser(description='Solve a batch of instances in parallel')
+    parser.add_argument('files',type=str,nargs='*',help='instance files, glob patterns or directories')
+    parser.add_argument('--manifest',type=str,default=None,help='File listing instance files, glob patterns or directories (one per line)')
+    parser.add_argument('--jobs',type=int,default=0,help='Number of worker processes (0: one per core)')
+    parser.add_argument('--time-limit',type=float,default=0,help='Seconds per instance, loading included (0: no limit)')
+    parser.add_argument('--conflict-limit',type=int,default=-1,help='Conflicts per instance (negative: no limit)')
+    parser.add_argument('--seed',type=int,default=12345,help='Random seed')
+    parser.add_argument('--preprocess',action='store_true',help='Simplify the instances before search')
+    parser.add_argument('--cache',type=str,nargs='?',const='',default=None,help='Load the instances from (or save them to) binary caches in the given directory (next to the instances by default)')
+    parser.add_argument('--format',type=str,default='json',choices=['json','csv'],help='One JSON object or one CSV row per instance')
+    parser.add_argument('--output',type=str,default='-',help='Output file (- for the standard output)')
+    args = parser.parse_args()
+
+    files = instances(args.files, args.manifest)
+    if len(files) == 0:
+        parser.error('no instance')
+
+    # the largest instances are started first, so that they do not finish alone at the end
+    files.sort(key=lambda cnffile: os.path.getsize(cnffile) if os.path.isfile(cnffile) else 0, reverse=True)
+    tasks = [(cnffile, args.time_limit, args.conflict_limit, args.seed, args.cache, args.preprocess) for cnffile in files]
+
+    output = sys.stdout if args.output == '-' else open(args.output, 'w')
+    if args.format == 'csv':
+        writer = csv.DictWriter(output, FIELDS)
+        writer.writeheader()
+    pool = multiprocessing.Pool(args.jobs or multiprocessing.cpu_count(), maxtasksperchild=1)
+    try:
+        for result in pool.imap_unordered(solveInstance, tasks):
+            if args.format == 'csv':
+                writer.writerow(result)
+            else:
+                output.write(json.dumps(result, sort_keys=True)+'\n')
+            output.flush()
+        pool.close()
+    except KeyboardInterrupt:
+        pool.terminate()
+    pool.join()
+    if output != sys.stdout:
+        output.close()
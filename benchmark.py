@@ -0,0 +1,70 @@
+#! /usr/bin/env python
+
+import os
+import sys
+import glob
+import time
+import argparse
+
+from Satire import *
+
+
+def benchmark(cnffile, limit, seed, solver_class=Solver):
+    """
+    solves cnffile (giving up after limit conflicts) and returns the outcome, the loading and solving times and the solver
+    """
+    solver = solver_class()
+    solver.setRandom(seed=seed)
+    start = time.time()
+    solver.readDimacs(cnffile)
+    loaded = time.time()
+    outcome = solver.restartSearch(limit=limit)
+
+    return outcome, loaded-start, time.time()-loaded, solver
+
+
+if __name__ == '__main__':
+
+    parser = argparse.ArgumentParser(description='Propagation throughput of Satire')
+    parser.add_argument('files',type=str,nargs='*',help='instance files (default: unif* and bmc-ibm-* in cnf_example)')
+    parser.add_argument('--limit',type=int,default=2000,help='Maximum number of conflicts per instance (negative: no limit)')
+    parser.add_argument('--seed',type=int,default=12345,help='Random seed')
+    parser.add_argument('--overhead',action='store_true',help='Compare with the instrumented solver (traces and checks set by VERBOSE and CHECKED)')
+    parser.add_argument('--repeat',type=int,default=3,help='With --overhead, number of runs of each solver (the fastest is kept)')
+    args = parser.parse_args()
+
+    files = args.files
+    if len(files) == 0:
+        files = sorted(glob.glob('cnf_example/unif*.cnf')) + sorted(glob.glob('cnf_example/bmc-ibm-*.cnf'))
+
+    if args.overhead:
+        # both solvers follow the same search, the difference of time is the cost of the tests of VERBOSE and CHECKED
+        print 'instance'.ljust(20), 'propagations'.rjust(12), 'solver(s)'.rjust(9), 'instr.(s)'.rjust(9), 'overhead(us/prop)'.rjust(17)
+        total_propag, total_time, total_instr = 0, 0.0, 0.0
+        for cnffile in files:
+            search_time, instr_time = float('inf'), float('inf')
+            for run in range(args.repeat):
+                outcome, load_time, run_time, solver = benchmark(cnffile, args.limit, args.seed)
+                search_time = min(search_time, run_time)
+                outcome, load_time, run_time, instr = benchmark(cnffile, args.limit, args.seed, InstrumentedSolver)
+                instr_time = min(instr_time, run_time)
+            num_propag = solver.num_propag.getValue()
+            if instr.num_propag.getValue() != num_propag:
+                print os.path.basename(cnffile).ljust(20), 'the two solvers diverged'
+                continue
+            total_propag += num_propag
+            total_time += search_time
+            total_instr += instr_time
+            print os.path.basename(cnffile).ljust(20), str(num_propag).rjust(12), ('%.2f'%search_time).rjust(9), ('%.2f'%instr_time).rjust(9), ('%.2f'%(1e6*(instr_time-search_time)/max(num_propag, 1))).rjust(17)
+        print 'total'.ljust(20), str(total_propag).rjust(12), ('%.2f'%total_time).rjust(9), ('%.2f'%total_instr).rjust(9), ('%.2f'%(1e6*(total_instr-total_time)/max(total_propag, 1))).rjust(17)
+        sys.exit(0)
+
+    print 'instance'.ljust(20), 'outcome'.rjust(7), 'load(s)'.rjust(8), 'search(s)'.rjust(9), 'conflicts'.rjust(9), 'propagations'.rjust(12), 'prop/s'.rjust(8)
+    total_propag, total_time = 0, 0.0
+    for cnffile in files:
+        outcome, load_time, search_time, solver = benchmark(cnffile, args.limit, args.seed)
+        num_propag = solver.num_propag.getValue()
+        total_propag += num_propag
+        total_time += search_time
+        print os.path.basename(cnffile).ljust(20), ('SAT' if outcome == TRUE else 'UNSAT' if outcome == FALSE else '?').rjust(7), ('%.2f'%load_time).rjust(8), ('%.2f'%search_time).rjust(9), str(solver.num_conflict.getValue()).rjust(9), str(num_propag).rjust(12), str(int(num_propag/max(search_time, 1e-6))).rjust(8)
+    print 'total'.ljust(20), ''.rjust(7), ''.rjust(8), ('%.2f'%total_time).rjust(9), ''.rjust(9), str(total_propag).rjust(12), str(int(total_propag/max(total_time, 1e-6))).rjust(8)
@@ -0,0 +1,38 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from Satire import *
+
+
+INSTANCE = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'cnf_example', 'uf20-010.cnf')
+
+
+class RepeatedAssumptions(unittest.TestCase):
+    """
+    repeated (or already true) assumptions open empty levels, so there can be more levels than atoms
+    """
+    def solver(self):
+        solver = Solver()
+        solver.readDimacs(INSTANCE)
+        return solver
+
+    def test_repeated(self):
+        for p in (lit(1), lit(-1), lit(2), lit(-2)):
+            self.assertEqual(self.solver().solve([p]*30), self.solver().solve([p]))
+
+    def test_repeated_incremental(self):
+        solver = self.solver()
+        for k in (30, 100):
+            self.assertEqual(solver.solve([lit(1)]*k), TRUE)
+            self.assertEqual(solver.solve([lit(-1)]*k+[lit(2)]*k), self.solver().solve([lit(-1), lit(2)]))
+
+    def test_contradictory(self):
+        solver = self.solver()
+        self.assertEqual(solver.solve([lit(1)]*30+[lit(-1)]), FALSE)
+        self.assertEqual(solver.solve([]), TRUE)
+
+
+if __name__ == '__main__':
+    unittest.main()